@@ -0,0 +1,330 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from Reminder import Reminder
+from ReminderManager import Page, ReminderManager, ReminderShards
+from RecurrenceRule import RecurrenceRule
+from ReminderBot import PAGE_SIZE, Dialog, PageRequest, browse_dialog, print_matches, print_menu, reminder_form, search_form
+from Scheduler import AsyncScheduler
+from StorageService import warn_legacy_store
+from TimeParser import TimeParser
+from User import User, UserService
+
+class AsyncReminderManager:
+    '''
+    Async face of a ReminderManager. Anything that may touch the disk runs
+    in the loop's executor, and a per-manager lock keeps mutations in order.
+    '''
+    def __init__(self, manager: ReminderManager):
+        self.manager = manager
+        self._lock = asyncio.Lock()
+
+    async def _run(self, func: Callable, *args):
+        async with self._lock:
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def add_reminder(self, reminder: Reminder) -> None:
+        await self._run(self.manager.add_reminder, reminder)
+
+    async def add_many(self, reminders: List[Reminder]) -> None:
+        await self._run(self.manager.add_many, reminders)
+
+    async def mark_completed(self, reminder: Reminder) -> None:
+        await self._run(self.manager.mark_completed, reminder)
+
+    async def remove_reminder(self, reminder: Reminder) -> None:
+        await self._run(self.manager.remove_reminder, reminder)
+
+    async def sync(self) -> None:
+        # waits for group-committed writes to reach the disk
+        await self._run(self.manager.storage.sync)
+
+    # reads run there too: each first picks up what other processes wrote,
+    # which may mean reading the journal or reloading the whole snapshot
+    async def get_all_reminders(self) -> List[Reminder]:
+        return await self._run(lambda: list(self.manager.get_all_reminders()))
+
+    async def get_pending_reminders(self) -> List[Reminder]:
+        return await self._run(self.manager.get_pending_reminders)
+
+    async def get_reminder(self, reminder_id: str) -> Optional[Reminder]:
+        return await self._run(self.manager.get_reminder, reminder_id)
+
+    async def page(self, **kwargs) -> Page:
+        return await self._run(lambda: self.manager.page(**kwargs))
+
+    async def render(self, reminders: List[Reminder]) -> List[str]:
+        return await self._run(self.manager.render, reminders)
+
+    async def search(self, query: str, **filters) -> List[Reminder]:
+        # the first search also builds the index
+        return await self._run(lambda: self.manager.search(query, **filters))
+
+@dataclass(eq=False)
+class Session:
+    # one connected client; due reminders for its user land in `notifications`
+    user: Optional[User] = None
+    notifications: "asyncio.Queue[Reminder]" = field(default_factory=asyncio.Queue)
+
+class AsyncReminderCore:
+    '''
+    Shared core for any number of concurrent sessions on one event loop:
+    per-user shards loaded off the loop, one AsyncScheduler for everyone,
+    and due reminders routed to the sessions of the reminder's owner.
+    '''
+    def __init__(self, storage_factory=None):
+        self.shards = ReminderShards(storage_factory=storage_factory)
+        self.user_service = UserService()
+        self.time_parser = TimeParser()
+        self.scheduler = AsyncScheduler(callback=self._deliver)
+        self._managers: Dict[str, AsyncReminderManager] = {}
+        self._sessions: Dict[str, Set[Session]] = {}
+        # reminder id -> owner, for routing scheduler callbacks
+        self._owners: Dict[str, str] = {}
+        # shards held while their user has a session, so they are never evicted under one
+        self._pinned: Dict[str, ReminderManager] = {}
+        self._shard_lock: Optional[asyncio.Lock] = None
+
+    async def start(self) -> None:
+        self._shard_lock = asyncio.Lock()
+        self.scheduler.start()
+
+    async def stop(self) -> None:
+        await self.scheduler.stop()
+        async with self._shard_lock:
+            await asyncio.get_running_loop().run_in_executor(None, self.shards.close)
+
+    async def _manager(self, username: str) -> AsyncReminderManager:
+        # keeps the shard and its async wrapper in step when sessions log in together
+        async with self._shard_lock:
+            # off the loop even when loaded: any get may evict (and close) idle shards
+            manager = await asyncio.get_running_loop().run_in_executor(None, self.shards.get, username)
+            # wrappers whose shard has been evicted (and closed) since are dropped
+            for name in [name for name in self._managers if name != username and not self.shards.is_loaded(name)]:
+                del self._managers[name]
+            wrapper = self._managers.get(username)
+            if wrapper is None or wrapper.manager is not manager:
+                wrapper = AsyncReminderManager(manager)
+                self._managers[username] = wrapper
+            return wrapper
+
+    def _arm(self, username: str, reminders: List[Reminder]) -> None:
+        for reminder in reminders:
+            self._owners[reminder.id] = username
+        self.scheduler.arm_all(reminders)
+
+    async def _deliver(self, reminders: List[Reminder]) -> None:
+        for reminder in reminders:
+            username = self._owners.pop(reminder.id, None)
+            for session in self._sessions.get(username, ()):
+                session.notifications.put_nowait(reminder)
+
+    async def login(self, session: Session, username: str, create: bool = False) -> bool:
+        loop = asyncio.get_running_loop()
+        user = await loop.run_in_executor(None, self.user_service.get_user, username)
+        if user is None and create:
+            user = await loop.run_in_executor(None, self.user_service.create_user, username)
+        if user is None:
+            return False
+        await self.logout(session)
+        session.user = user
+        first_session = not self._sessions.get(username)
+        self._sessions.setdefault(username, set()).add(session)
+        if first_session:
+            try:
+                self._pinned[username] = await loop.run_in_executor(None, self.shards.acquire, username)
+            except IOError:
+                # the user's reminders can't be read: the login doesn't happen
+                await self.logout(session)
+                raise
+            manager = await self._manager(username)
+            self._arm(username, await manager.get_pending_reminders())
+        return True
+
+    async def logout(self, session: Session) -> None:
+        if session.user is None:
+            return
+        username = session.user.username
+        sessions = self._sessions.get(username, set())
+        sessions.discard(session)
+        session.user = None
+        if not sessions:
+            # nobody left to notify: stop tracking this user's reminders
+            self._sessions.pop(username, None)
+            pinned = self._pinned.pop(username, None)
+            if pinned is not None:
+                self.shards.release(pinned)
+            for reminder_id in [rid for rid, owner in self._owners.items() if owner == username]:
+                self.scheduler.cancel(reminder_id)
+                del self._owners[reminder_id]
+
+    def _require_user(self, session: Session) -> str:
+        if session.user is None:
+            raise PermissionError("Please log in first.")
+        return session.user.username
+
+    async def add_reminder(self, session: Session, title: str, date_str: str, description: Optional[str] = None,
+                           recurrence_rule: Optional[RecurrenceRule] = None) -> Optional[Reminder]:
+        username = self._require_user(session)
+        when = self.time_parser.parse(date_str)
+        if when is None:
+            return None
+        reminder = Reminder(title=title, datetime=when, description=description, recurrence_rule=recurrence_rule)
+        await (await self._manager(username)).add_reminder(reminder)
+        self._arm(username, [reminder])
+        return reminder
+
+    async def list_reminders(self, session: Session, pending_only: bool = False) -> List[Reminder]:
+        manager = await self._manager(self._require_user(session))
+        if pending_only:
+            return await manager.get_pending_reminders()
+        return await manager.get_all_reminders()
+
+    async def list_page(self, session: Session, after: Optional[str] = None, before: Optional[str] = None,
+                        pending_only: bool = False, limit: int = 20) -> Tuple[Page, List[str]]:
+        # one page of reminders and their display lines
+        manager = await self._manager(self._require_user(session))
+        page = await manager.page(after=after, before=before, limit=limit, pending_only=pending_only)
+        return page, await manager.render(page.reminders)
+
+    async def search(self, session: Session, query: str, pending_only: bool = False, limit: int = 20) -> List[Reminder]:
+        manager = await self._manager(self._require_user(session))
+        return await manager.search(query, pending_only=pending_only, limit=limit)
+
+    async def mark_completed(self, session: Session, reminder_id: str) -> Optional[Reminder]:
+        username = self._require_user(session)
+        manager = await self._manager(username)
+        reminder = await manager.get_reminder(reminder_id)
+        if reminder is None:
+            return None
+        await manager.mark_completed(reminder)
+        if reminder.completed:
+            self.scheduler.cancel(reminder.id)
+        else:
+            # a recurring series moved on to its next occurrence
+            self._arm(username, [reminder])
+        return reminder
+
+    async def remove_reminder(self, session: Session, reminder_id: str) -> bool:
+        manager = await self._manager(self._require_user(session))
+        reminder = await manager.get_reminder(reminder_id)
+        if reminder is None:
+            return False
+        await manager.remove_reminder(reminder)
+        self.scheduler.cancel(reminder.id)
+        self._owners.pop(reminder.id, None)
+        return True
+
+# --- command-line client -----------------------------------------------------
+
+async def ainput(prompt: str) -> str:
+    # input() blocks, so it waits in a worker thread while the loop keeps running
+    return await asyncio.to_thread(input, prompt)
+
+async def print_notifications(session: Session) -> None:
+    while True:
+        reminder = await session.notifications.get()
+        print(f"\nReminder due: {reminder}")
+
+async def run_dialog(core: AsyncReminderCore, session: Session, dialog: Dialog):
+    # drives one of ReminderBot's menu dialogs with ainput() and the core
+    reply = None
+    try:
+        while True:
+            request = dialog.send(reply)
+            if isinstance(request, PageRequest):
+                reply = await core.list_page(session, after=request.after, before=request.before,
+                                             pending_only=request.pending_only, limit=PAGE_SIZE)
+            else:
+                reply = await ainput(request)
+    except StopIteration as done:
+        return done.value
+
+async def browse_reminders(core: AsyncReminderCore, session: Session, pending_only: bool = False,
+                           prompt: Optional[str] = None) -> Optional[Reminder]:
+    return await run_dialog(core, session, browse_dialog(pending_only, prompt))
+
+async def run_cli(core: AsyncReminderCore) -> None:
+    session = Session()
+    notifier = asyncio.create_task(print_notifications(session))
+    try:
+        while True:
+            try:
+                print_menu(session.user.username if session.user else None)
+                if not session.user:
+                    choice = await ainput("\nEnter your choice (1-2): ")
+                    if choice == "1":
+                        username = await ainput("Enter username: ")
+                        if await core.login(session, username):
+                            print(f"Welcome back, {username}!")
+                        elif (await ainput("User not found. Would you like to create a new account? (y/n): ")).lower() == 'y':
+                            if await core.login(session, username, create=True):
+                                print(f"Account created successfully! Welcome, {username}!")
+                            else:
+                                print("Failed to create account.")
+                    elif choice == "2":
+                        print("Goodbye!")
+                        return
+                    else:
+                        print("Invalid choice. Please try again.")
+                    continue
+
+                choice = await ainput("\nEnter your choice (1-7): ")
+                if choice == "1":
+                    title, date_str, description, rule = await run_dialog(core, session, reminder_form())
+                    if await core.add_reminder(session, title, date_str, description or None, rule):
+                        print("Reminder added successfully!")
+                    else:
+                        print("Failed to add reminder. Please check the date format.")
+                elif choice == "2":
+                    if not (await core.list_page(session, limit=1))[0].reminders:
+                        print("No reminders found.")
+                        continue
+                    await browse_reminders(core, session)
+                elif choice == "3":
+                    if not (await core.list_page(session, pending_only=True, limit=1))[0].reminders:
+                        print("No pending reminders.")
+                        continue
+                    reminder = await browse_reminders(core, session, pending_only=True,
+                                                      prompt="Enter reminder number to mark as completed: ")
+                    if reminder and await core.mark_completed(session, reminder.id):
+                        print("Reminder marked as completed!")
+                        if not reminder.completed:
+                            print(f"Next occurrence scheduled for: {reminder.datetime.strftime('%Y-%m-%d %H:%M')}")
+                elif choice == "4":
+                    if not (await core.list_page(session, limit=1))[0].reminders:
+                        print("No reminders to remove.")
+                        continue
+                    reminder = await browse_reminders(core, session, prompt="Enter reminder number to remove: ")
+                    if reminder and await core.remove_reminder(session, reminder.id):
+                        print("Reminder removed successfully!")
+                elif choice == "5":
+                    query, pending_only = await run_dialog(core, session, search_form())
+                    reminders = await core.search(session, query, pending_only=pending_only, limit=PAGE_SIZE)
+                    print_matches([str(reminder) for reminder in reminders])
+                elif choice == "6":
+                    await core.logout(session)
+                    print("Logged out successfully")
+                elif choice == "7":
+                    print("Goodbye!")
+                    return
+                else:
+                    print("Invalid choice. Please try again.")
+            except IOError as e:
+                # an unreadable reminder store is reported and the menu stays up
+                print(f"Error loading reminders: {e}")
+    finally:
+        notifier.cancel()
+        await core.logout(session)
+
+async def main() -> None:
+    warn_legacy_store()
+    core = AsyncReminderCore()
+    await core.start()
+    try:
+        await run_cli(core)
+    finally:
+        await core.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
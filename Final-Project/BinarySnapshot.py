@@ -0,0 +1,123 @@
+import struct
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+from Reminder import Reminder
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+
+# Compact snapshot encoding, an alternative to the JSON array:
+#
+#   header   magic, format version, string count, record count, CRC-32 of the rest
+#   strings  one uint32 byte length per string, then the UTF-8 bytes back to back
+#   records  one fixed-size struct per reminder
+#
+# Titles, descriptions and ids that aren't uuid hex go in the string table
+# once however often they repeat; datetimes are int64 microseconds since
+# 1970-01-01 (naive, like everywhere else) and the recurrence type a byte.
+MAGIC = b"RMDB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")  # magic, version, reserved, strings, records, crc32
+# id, due, title, description, flags, rule type, rule interval, rule anchor
+RECORD = struct.Struct("<16sqIIBBiq")
+NO_STRING = 0xFFFFFFFF
+
+# record flags
+COMPLETED = 1
+RECURRING = 2
+HAS_ANCHOR = 4
+STRING_ID = 8  # the id field holds a string table index instead of uuid bytes
+
+# fixed codes, never reordered: they are part of the file format
+TYPE_CODES = {RecurrenceType.DAILY: 1, RecurrenceType.WEEKLY: 2, RecurrenceType.MONTHLY: 3, RecurrenceType.YEARLY: 4}
+TYPES = {code: kind for kind, code in TYPE_CODES.items()}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def is_binary(prefix: bytes) -> bool:
+    return prefix[:len(MAGIC)] == MAGIC
+
+def uuid_bytes(reminder_id: str):
+    # the 16 raw bytes of a lowercase uuid hex id, or None for any other id
+    if len(reminder_id) != 32:
+        return None
+    try:
+        raw = bytes.fromhex(reminder_id)
+    except ValueError:
+        return None
+    return raw if raw.hex() == reminder_id else None
+
+def encode(reminders: Iterable[Reminder]) -> bytes:
+    strings: Dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    records = bytearray()
+    count = 0
+    for reminder in reminders:
+        flags = (COMPLETED if reminder.completed else 0) | (RECURRING if reminder.is_recurring else 0)
+        raw_id = uuid_bytes(reminder.id)
+        if raw_id is None:
+            flags |= STRING_ID
+            raw_id = struct.pack("<I", intern(reminder.id))
+        rule = reminder.recurrence_rule
+        kind, interval, anchor = 0, 0, 0
+        if rule is not None:
+            kind, interval = TYPE_CODES[rule.type], rule.interval
+            if rule.anchor is not None:
+                flags |= HAS_ANCHOR
+                anchor = (rule.anchor - _EPOCH) // _MICROSECOND
+        description = NO_STRING if reminder.description is None else intern(reminder.description)
+        records += RECORD.pack(raw_id, (reminder.datetime - _EPOCH) // _MICROSECOND, intern(reminder.title),
+                               description, flags, kind, interval, anchor)
+        count += 1
+    table = [text.encode() for text in strings]
+    body = b"".join([struct.pack(f"<{len(table)}I", *map(len, table)), *table, records])
+    return HEADER.pack(MAGIC, VERSION, 0, len(table), count, zlib.crc32(body)) + body
+
+def decode(data) -> List[Reminder]:
+    # `data` may be an mmap: every view of it is released on the way out, errors
+    # included, or closing the map fails with BufferError and hides the real error
+    with memoryview(data) as view:
+        if len(view) < HEADER.size:
+            raise ValueError("truncated binary snapshot")
+        magic, version, _, string_count, record_count, checksum = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("not a binary snapshot")
+        if version > VERSION:
+            raise ValueError(f"binary snapshot version {version} is newer than this program reads ({VERSION})")
+        with view[HEADER.size:] as body:
+            if zlib.crc32(body) != checksum:
+                raise ValueError("binary snapshot checksum mismatch")
+        offset = HEADER.size
+        lengths = struct.unpack_from(f"<{string_count}I", view, offset)
+        offset += 4 * string_count
+        strings = []
+        for length in lengths:
+            with view[offset:offset + length] as text:
+                strings.append(str(text, "utf-8"))
+            offset += length
+        if offset + record_count * RECORD.size != len(view):
+            raise ValueError("binary snapshot size mismatch")
+
+        reminders = []
+        with view[offset:] as records:
+            for raw_id, due, title, description, flags, kind, interval, anchor in RECORD.iter_unpack(records):
+                rule = None
+                if kind:
+                    rule = RecurrenceRule(TYPES[kind], interval,
+                                          _EPOCH + timedelta(microseconds=anchor) if flags & HAS_ANCHOR else None)
+                reminders.append(Reminder(
+                    strings[title],
+                    _EPOCH + timedelta(microseconds=due),
+                    None if description == NO_STRING else strings[description],
+                    bool(flags & RECURRING),
+                    rule,
+                    bool(flags & COMPLETED),
+                    strings[struct.unpack_from("<I", raw_id)[0]] if flags & STRING_ID else raw_id.hex(),
+                ))
+        return reminders
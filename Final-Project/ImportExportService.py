@@ -0,0 +1,305 @@
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from Reminder import Reminder
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+from ReminderManager import ReminderManager
+from TimeParser import TimeParser
+
+FIELDS = ["title", "datetime", "description", "recurrence", "interval", "completed"]
+
+ICS_FREQUENCIES = {
+    RecurrenceType.DAILY: "DAILY",
+    RecurrenceType.WEEKLY: "WEEKLY",
+    RecurrenceType.MONTHLY: "MONTHLY",
+    RecurrenceType.YEARLY: "YEARLY",
+}
+ICS_TYPES = {freq: rtype for rtype, freq in ICS_FREQUENCIES.items()}
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    rejected: List[Tuple[int, str]] = field(default_factory=list)  # (record number, reason)
+    elapsed: float = 0.0
+
+    def __str__(self) -> str:
+        rate = self.imported / self.elapsed if self.elapsed else 0.0
+        return f"Imported {self.imported} reminders, rejected {len(self.rejected)} ({rate:,.0f} reminders/s)"
+
+def _detect_format(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if suffix == ".ics":
+        return "ics"
+    raise ValueError(f"Unknown reminder file format: {path.suffix}")
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in ("1", "true", "yes", "y", "x")
+
+# --- iCalendar helpers -------------------------------------------------------
+
+def ics_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def ics_unescape(text: str) -> str:
+    result, i = [], 0
+    while i < len(text):
+        if text[i] == "\\" and i + 1 < len(text):
+            result.append("\n" if text[i + 1] in "nN" else text[i + 1])
+            i += 2
+        else:
+            result.append(text[i])
+            i += 1
+    return "".join(result)
+
+def ics_fold(line: str) -> str:
+    # content lines longer than 75 characters continue on lines starting with a space
+    chunks = [line[i:i + 74] for i in range(0, len(line), 74)] or [""]
+    return "\r\n ".join(chunks) + "\r\n"
+
+def ics_datetime(value: str, tzid: Optional[str] = None) -> datetime:
+    # DTSTART values: 20260105T103000, 20260105T103000Z or an all-day 20260105,
+    # returned as the naive local time the rest of the app uses. UTC and TZID
+    # times are converted; floating times and dates are taken as they are
+    if "T" not in value:
+        return datetime.strptime(value, "%Y%m%d")
+    when = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        zone = timezone.utc
+    elif tzid:
+        try:
+            zone = ZoneInfo(tzid)
+        except (ZoneInfoNotFoundError, ValueError):
+            # a zone name we don't know (Outlook's "W. Europe Standard Time"): keep the wall clock
+            return when
+    else:
+        return when
+    return when.replace(tzinfo=zone).astimezone().replace(tzinfo=None)
+
+def ics_unfold(lines: Iterator[str]) -> Iterator[str]:
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def ics_components(lines: Iterator[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    # yields (component number, property -> value) for each VEVENT/VTODO;
+    # a TZID parameter is kept as "<property>;TZID", other parameters are dropped
+    properties: Optional[Dict[str, str]] = None
+    count = 0
+    # sub-components open inside the current one: an alarm's DESCRIPTION is not the event's
+    depth = 0
+    for line in ics_unfold(lines):
+        if properties is None:
+            if line in ("BEGIN:VEVENT", "BEGIN:VTODO"):
+                properties = {}
+                depth = 0
+        elif line.startswith("BEGIN:"):
+            depth += 1
+        elif line.startswith("END:"):
+            if depth:
+                depth -= 1
+            else:
+                count += 1
+                yield count, properties
+                properties = None
+        elif depth == 0 and ":" in line:
+            name, value = line.split(":", 1)
+            name, *parameters = name.split(";")
+            name = name.upper()
+            properties[name] = value
+            for parameter in parameters:
+                key, _, tzid = parameter.partition("=")
+                if key.upper() == "TZID":
+                    properties[f"{name};TZID"] = tzid.strip('"')
+
+def ics_to_reminder(properties: Dict[str, str]) -> Reminder:
+    rule = None
+    if "RRULE" in properties:
+        parts = dict(part.split("=", 1) for part in properties["RRULE"].split(";") if "=" in part)
+        rule = RecurrenceRule(type=ICS_TYPES[parts["FREQ"]], interval=int(parts.get("INTERVAL", 1)))
+    description = properties.get("DESCRIPTION")
+    due = "DTSTART" if properties.get("DTSTART") else "DUE"
+    return Reminder(
+        title=ics_unescape(properties["SUMMARY"]),
+        datetime=ics_datetime(properties[due], properties.get(f"{due};TZID")),
+        description=ics_unescape(description) if description else None,
+        recurrence_rule=rule,
+        completed=properties.get("STATUS", "").upper() == "COMPLETED"
+    )
+
+def reminder_to_ics(reminder: Reminder, uid: Optional[str] = None) -> str:
+    lines = [
+        "BEGIN:VTODO",
+        f"UID:{uid or reminder.id}",
+        f"SUMMARY:{ics_escape(reminder.title)}",
+        f"DTSTART:{reminder.datetime.strftime('%Y%m%dT%H%M%S')}",
+    ]
+    if reminder.description:
+        lines.append(f"DESCRIPTION:{ics_escape(reminder.description)}")
+    if reminder.recurrence_rule:
+        rule = reminder.recurrence_rule
+        lines.append(f"RRULE:FREQ={ICS_FREQUENCIES[rule.type]};INTERVAL={rule.interval}")
+    if reminder.completed:
+        lines.append("STATUS:COMPLETED")
+    lines.append("END:VTODO")
+    return "".join(ics_fold(line) for line in lines)
+
+# --- import / export ---------------------------------------------------------
+
+class ImportExportService:
+    def __init__(self, reminder_manager: ReminderManager, time_parser: Optional[TimeParser] = None,
+                 batch_size: int = 5000):
+        self.reminder_manager = reminder_manager
+        self.time_parser = time_parser or TimeParser()
+        self.batch_size = batch_size
+
+    def _read_rows(self, f: TextIO, fmt: str) -> Iterator[Tuple[int, object]]:
+        # yields (record number, row dict or ready-made Reminder) without reading ahead
+        if fmt == "csv":
+            for number, row in enumerate(csv.DictReader(f), 1):
+                yield number, row
+        elif fmt == "ndjson":
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        row = json.loads(line)
+                    except ValueError as e:
+                        yield number, e
+                        continue
+                    yield number, row if isinstance(row, dict) else ValueError("not a JSON object")
+        elif fmt == "ics":
+            for number, properties in ics_components(f):
+                try:
+                    yield number, ics_to_reminder(properties)
+                except (KeyError, ValueError) as e:
+                    yield number, e
+
+    def _build_batch(self, rows: List[Tuple[int, object]], report: ImportReport) -> List[Reminder]:
+        # dates for the whole batch go through TimeParser in one call
+        pending = [(n, row) for n, row in rows if isinstance(row, dict)]
+        dates = self.time_parser.parse_many(str(row.get("datetime") or "") for _, row in pending)
+        dates_by_number = {n: date for (n, _), date in zip(pending, dates)}
+        reminders = []
+        for number, row in rows:
+            if isinstance(row, Reminder):
+                reminders.append(row)
+                continue
+            if isinstance(row, Exception):
+                report.rejected.append((number, f"unreadable record: {row}"))
+                continue
+            title = str(row.get("title") or "").strip()
+            if not title:
+                report.rejected.append((number, "missing title"))
+                continue
+            when = dates_by_number[number]
+            if when is None:
+                report.rejected.append((number, f"unrecognised date: {row.get('datetime')!r}"))
+                continue
+            rule = None
+            if row.get("recurrence"):
+                interval = row.get("interval")
+                try:
+                    # an empty CSV cell means the default; 0 or a negative interval is rejected
+                    rule = RecurrenceRule(type=RecurrenceType(row["recurrence"]),
+                                          interval=int(interval) if interval not in (None, "") else 1)
+                except (TypeError, ValueError) as e:
+                    report.rejected.append((number, f"invalid recurrence {row['recurrence']!r}: {e}"))
+                    continue
+            reminders.append(Reminder(
+                title=title,
+                datetime=when,
+                description=str(row.get("description") or "") or None,
+                recurrence_rule=rule,
+                completed=_parse_bool(row.get("completed"))
+            ))
+        return reminders
+
+    def import_file(self, path, fmt: Optional[str] = None) -> ImportReport:
+        path = Path(path)
+        fmt = fmt or _detect_format(path)
+        report = ImportReport()
+        begin = time.perf_counter()
+        with path.open('r', newline='' if fmt == "csv" else None) as f:
+            batch: List[Tuple[int, object]] = []
+            for item in self._read_rows(f, fmt):
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self._flush(batch, report)
+                    batch = []
+            if batch:
+                self._flush(batch, report)
+        report.elapsed = time.perf_counter() - begin
+        return report
+
+    def _flush(self, batch: List[Tuple[int, object]], report: ImportReport) -> None:
+        reminders = self._build_batch(batch, report)
+        if reminders:
+            self.reminder_manager.add_many(reminders)
+            report.imported += len(reminders)
+
+    def _row(self, reminder: Reminder) -> Dict[str, object]:
+        rule = reminder.recurrence_rule
+        return {
+            "title": reminder.title,
+            "datetime": self.time_parser.format_datetime(reminder.datetime),
+            "description": reminder.description or "",
+            "recurrence": rule.type.value if rule else "",
+            "interval": rule.interval if rule else "",
+            "completed": reminder.completed,
+        }
+
+    def export_file(self, path, fmt: Optional[str] = None) -> int:
+        # writes one reminder at a time, no intermediate list
+        path = Path(path)
+        fmt = fmt or _detect_format(path)
+        count = 0
+        with path.open('w', newline='' if fmt in ("csv", "ics") else None) as f:
+            if fmt == "csv":
+                writer = csv.DictWriter(f, fieldnames=FIELDS)
+                writer.writeheader()
+            elif fmt == "ics":
+                f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//ReminderBot//EN\r\n")
+            for reminder in self.reminder_manager.get_all_reminders():
+                if fmt == "csv":
+                    writer.writerow(self._row(reminder))
+                elif fmt == "ndjson":
+                    f.write(json.dumps(self._row(reminder)) + "\n")
+                else:
+                    f.write(reminder_to_ics(reminder))
+                count += 1
+            if fmt == "ics":
+                f.write("END:VCALENDAR\r\n")
+        return count
+
+if __name__ == "__main__":
+    # python ImportExportService.py import|export <username> <file>
+    if len(sys.argv) != 4 or sys.argv[1] not in ("import", "export"):
+        print("Usage: python ImportExportService.py import|export <username> <file>")
+        sys.exit(1)
+    service = ImportExportService(ReminderManager(username=sys.argv[2]))
+    if sys.argv[1] == "import":
+        result = service.import_file(sys.argv[3])
+        print(result)
+        for number, reason in result.rejected[:20]:
+            print(f"  record {number}: {reason}")
+    else:
+        print(f"Exported {service.export_file(sys.argv[3])} reminders")
@@ -0,0 +1,267 @@
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# latency buckets in seconds: 1 us up to ~16 s, doubling each step
+LATENCY_BUCKETS = tuple(1e-6 * 2 ** i for i in range(25))
+# size buckets (bytes or list lengths): 1 up to ~1G, 4x each step
+SIZE_BUCKETS = tuple(4 ** i for i in range(16))
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        # upper bound of the bucket holding the q-th observation
+        target = q * self.count
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= target:
+                return bound
+        return float("inf")
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Metrics:
+    '''
+    Counters, gauges and histograms for the reminder lifecycle. Disabled by
+    default: every instrumented call site checks `metrics.enabled` first,
+    so the cost when off is one attribute read. Set REMINDER_METRICS=1 (or
+    call enable()) to collect, and dump with to_prometheus() or to_json().
+    '''
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def _timing(self, name: str, labels: Dict[str, str]) -> Iterator[None]:
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - begin, **labels)
+
+    def timer(self, name: str, **labels: str):
+        # `with metrics.timer("x_seconds"):` records the block's duration
+        return self._timing(name, labels) if self.enabled else nullcontext()
+
+    def timed(self, name: str, **labels: str) -> Callable:
+        # decorator form of timer()
+        def decorate(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                begin = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - begin, **labels)
+            return wrapper
+        return decorate
+
+    def to_dict(self) -> Dict:
+        def label_str(labels: Labels) -> str:
+            return ",".join(f"{k}={v}" for k, v in labels)
+
+        with self._lock:
+            result: Dict[str, Dict] = {"counters": {}, "gauges": {}, "histograms": {}}
+            for (name, labels), value in sorted(self._counters.items()):
+                result["counters"].setdefault(name, {})[label_str(labels)] = value
+            for (name, labels), value in sorted(self._gauges.items()):
+                result["gauges"].setdefault(name, {})[label_str(labels)] = value
+            for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                result["histograms"].setdefault(name, {})[label_str(labels)] = {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "p50": histogram.quantile(0.5),
+                    "p99": histogram.quantile(0.99),
+                }
+            return result
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        # Prometheus text exposition format
+        def fmt(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(labels) + ([extra] if extra else [])
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+
+        lines: List[str] = []
+        with self._lock:
+            for kind, series in (("counter", self._counters), ("gauge", self._gauges)):
+                typed = set()
+                for (name, labels), value in sorted(series.items()):
+                    if name not in typed:
+                        lines.append(f"# TYPE {name} {kind}")
+                        typed.add(name)
+                    lines.append(f"{name}{fmt(labels)} {value}")
+            typed = set()
+            for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                running = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    running += count
+                    lines.append(f"{name}_bucket{fmt(labels, ('le', f'{bound:g}'))} {running}")
+                lines.append(f"{name}_bucket{fmt(labels, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{name}_sum{fmt(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{fmt(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path) -> None:
+        # .json gets JSON, anything else the Prometheus text format
+        path = Path(path)
+        path.write_text(self.to_json() if path.suffix == ".json" else self.to_prometheus())
+
+metrics = Metrics(enabled=os.environ.get("REMINDER_METRICS", "") not in ("", "0"))
+
+# --- profiling hooks ---------------------------------------------------------
+
+class SamplingProfiler:
+    '''
+    Low-overhead alternative to cProfile: a background thread samples the
+    profiled thread's stack every `interval` seconds. collapsed() gives the
+    "frame;frame;frame count" lines flame graph tools read.
+    '''
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    @contextmanager
+    def sampling(self) -> Iterator[None]:
+        self._target = threading.get_ident()
+        self._stop.clear()
+        thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            self._stop.set()
+            thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+class CommandProfiler:
+    '''
+    Wraps every method of an object whose name starts with `prefix` (e.g.
+    ReminderBot's handle_* commands) in cProfile or the sampling profiler,
+    accumulating across calls. Enable with REMINDER_PROFILE=cprofile|sample.
+    '''
+    def __init__(self, mode: str = "cprofile", interval: float = 0.001):
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"Unknown profiler mode: {mode}")
+        self.mode = mode
+        self.profile = None
+        if mode == "cprofile":
+            # imported here: the profilers cost more to import than every other module of ours
+            import cProfile
+            self.profile = cProfile.Profile()
+        self.sampler = SamplingProfiler(interval) if mode == "sample" else None
+        self._lock = threading.Lock()
+
+    def wrap(self, obj: object, prefix: str = "handle_") -> None:
+        for name in dir(type(obj)):
+            if name.startswith(prefix) and callable(getattr(obj, name)):
+                setattr(obj, name, self._wrap(getattr(obj, name)))
+
+    def _wrap(self, method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            # only one profiled command at a time; nested calls just run
+            if not self._lock.acquire(blocking=False):
+                return method(*args, **kwargs)
+            try:
+                if self.profile is not None:
+                    return self.profile.runcall(method, *args, **kwargs)
+                with self.sampler.sampling():
+                    return method(*args, **kwargs)
+            finally:
+                self._lock.release()
+        return wrapper
+
+    def report(self, limit: int = 30) -> str:
+        if self.profile is not None:
+            import io
+            import pstats
+            out = io.StringIO()
+            pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(limit)
+            return out.getvalue()
+        return self.sampler.collapsed()
+
+    def dump(self, path) -> None:
+        # cProfile: a pstats file for snakeviz/pstats; sampling: collapsed stacks
+        if self.profile is not None:
+            self.profile.dump_stats(str(path))
+        else:
+            Path(path).write_text(self.sampler.collapsed())
@@ -1,4 +1,333 @@
+import http.client
+import json
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+from Reminder import Reminder
+
+@dataclass
+class Notification:
+    reminder: Reminder
+    user: Optional[str] = None
+    # the occurrence being announced; a recurring reminder moves on afterwards
+    due: Optional[datetime] = None
+    submitted: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        if self.due is None:
+            self.due = self.reminder.datetime
+
+    @property
+    def key(self) -> Tuple:
+        # identical notifications share a key and are only delivered once
+        return (self.user, self.reminder.id, self.due)
+
+    def to_dict(self) -> Dict:
+        return {
+            "user": self.user,
+            "id": self.reminder.id,
+            "title": self.reminder.title,
+            "description": self.reminder.description,
+            "due": self.due.isoformat(),
+        }
+
+    def __str__(self) -> str:
+        return f"Reminder due: {self.reminder}"
+
+class TokenBucket:
+    # allows `rate` tokens per second with bursts of up to `capacity`
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        # blocks until the tokens are available; returns the time spent waiting
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+# --- sinks -------------------------------------------------------------------
+
+class Sink:
+    '''
+    Somewhere notifications get delivered. Subclasses implement send() for a
+    whole batch and raise on failure; the pipeline handles batching, rate
+    limiting and retries. `concurrency` caps how many of the pool's workers
+    a sink may tie up, so a slow sink cannot starve the others.
+    '''
+    name = "sink"
+
+    def __init__(self, batch_size: int = 100, rate: Optional[float] = None, concurrency: int = 1):
+        self.batch_size = batch_size
+        # notifications per second; None means unlimited
+        self.rate = rate
+        self.concurrency = concurrency
+
+    def send(self, batch: List[Notification]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+class ConsoleSink(Sink):
+    name = "console"
+
+    def send(self, batch: List[Notification]) -> None:
+        print("".join(f"\n{notification}" for notification in batch))
+
+class FileSink(Sink):
+    # appends one JSON line per notification
+    name = "file"
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def send(self, batch: List[Notification]) -> None:
+        text = "".join(json.dumps(n.to_dict()) + "\n" for n in batch)
+        with self._lock, self.path.open('a') as f:
+            f.write(text)
+
+class WebhookSink(Sink):
+    # POSTs each batch as a JSON array; connections are kept alive per worker
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 5.0, **kwargs):
+        super().__init__(**kwargs)
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port
+        self.path = parts.path or "/"
+        self.https = parts.scheme == "https"
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = self._local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def send(self, batch: List[Notification]) -> None:
+        body = json.dumps([n.to_dict() for n in batch])
+        conn = self._connection()
+        try:
+            conn.request("POST", self.path, body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            # drop the broken connection; the retry opens a fresh one
+            conn.close()
+            self._local.conn = None
+            raise
+        if response.status >= 300:
+            raise IOError(f"webhook returned {response.status}")
+
+# --- pipeline ----------------------------------------------------------------
+
+class _SinkLane:
+    # per-sink queue, rate limiter and cap on in-flight batches
+    def __init__(self, sink: Sink, max_queue: int):
+        self.sink = sink
+        self.queue: "queue.Queue[Notification]" = queue.Queue(max_queue)
+        self.bucket = TokenBucket(sink.rate, max(sink.rate, sink.batch_size)) if sink.rate else None
+        self.slots = threading.Semaphore(sink.concurrency)
+        self.thread: Optional[threading.Thread] = None
+
 class NotificationService:
     '''
-    Implement
-    '''
\ No newline at end of file
+    Delivers due reminders through pluggable sinks. Each sink has a bounded
+    queue drained by its own dispatcher thread, which gathers batches, waits
+    on the sink's token bucket and hands the batch to a shared worker pool.
+    Failed batches are retried with exponential backoff; identical
+    notifications submitted within `dedup_window` seconds are dropped.
+    '''
+    def __init__(self, sinks: Optional[Iterable[Sink]] = None, workers: int = 4, max_queue: int = 10000,
+                 linger: float = 0.05, max_retries: int = 3, backoff: float = 0.5, dedup_window: float = 3600):
+        self.linger = linger
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.dedup_window = dedup_window
+        self._lanes = [_SinkLane(sink, max_queue) for sink in (sinks if sinks is not None else [ConsoleSink()])]
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="NotificationWorker")
+        self._seen: "OrderedDict[Tuple, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._running = False
+        self._started_at = time.monotonic()
+        self._in_flight = 0
+        self._idle = threading.Condition(self._lock)
+        # delivery metrics
+        self.submitted = 0
+        self.delivered = 0
+        self.failed = 0
+        self.retries = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self._lags: Deque[float] = deque(maxlen=10000)
+        self.start()
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        for lane in self._lanes:
+            lane.thread = threading.Thread(target=self._dispatch, args=(lane,),
+                                           name=f"NotificationDispatch-{lane.sink.name}", daemon=True)
+            lane.thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        # delivers what is already queued, then shuts the pool down
+        self.drain(timeout)
+        self._running = False
+        for lane in self._lanes:
+            if lane.thread:
+                lane.thread.join()
+        self._pool.shutdown(wait=True)
+        for lane in self._lanes:
+            lane.sink.close()
+
+    def submit(self, notification: Notification) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            # expire old dedup entries; they are kept in submission order
+            while self._seen and next(iter(self._seen.values())) < now - self.dedup_window:
+                self._seen.popitem(last=False)
+            if notification.key in self._seen:
+                self.deduplicated += 1
+                return False
+            self._seen[notification.key] = now
+            self.submitted += 1
+        accepted = False
+        for lane in self._lanes:
+            try:
+                lane.queue.put_nowait(notification)
+                accepted = True
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+        if not accepted:
+            # nothing was queued, so a retry must not be taken for a duplicate
+            with self._lock:
+                self._seen.pop(notification.key, None)
+        return accepted
+
+    def notify(self, reminders: Iterable[Reminder], user: Optional[str] = None) -> int:
+        # convenient entry point for the scheduler callback
+        return sum(self.submit(Notification(reminder, user)) for reminder in reminders)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        # waits until every queued notification has been delivered or given up on
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._in_flight or any(lane.queue.unfinished_tasks for lane in self._lanes):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(min(remaining, 0.05) if remaining is not None else 0.05)
+        return True
+
+    def queue_depth(self) -> int:
+        return sum(lane.queue.qsize() for lane in self._lanes)
+
+    def get_metrics(self) -> Dict[str, float]:
+        with self._lock:
+            lags = sorted(self._lags)
+            elapsed = time.monotonic() - self._started_at
+            return {
+                "queue_depth": self.queue_depth(),
+                "in_flight": self._in_flight,
+                "submitted": self.submitted,
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "retries": self.retries,
+                "deduplicated": self.deduplicated,
+                "dropped": self.dropped,
+                "throughput": self.delivered / elapsed if elapsed else 0.0,
+                "p50_lag": lags[len(lags) // 2] if lags else 0.0,
+                "p99_lag": lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0,
+                "max_lag": lags[-1] if lags else 0.0,
+            }
+
+    def _next_batch(self, lane: _SinkLane) -> List[Notification]:
+        # blocks for the first notification, then lingers briefly to fill the batch
+        try:
+            batch = [lane.queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.linger
+        while len(batch) < lane.sink.batch_size:
+            try:
+                batch.append(lane.queue.get_nowait())
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(lane.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+        return batch
+
+    def _dispatch(self, lane: _SinkLane) -> None:
+        while self._running or not lane.queue.empty():
+            batch = self._next_batch(lane)
+            if not batch:
+                continue
+            if lane.bucket:
+                lane.bucket.acquire(len(batch))
+            lane.slots.acquire()
+            with self._lock:
+                self._in_flight += 1
+            for _ in batch:
+                lane.queue.task_done()
+            self._pool.submit(self._deliver, lane, batch)
+
+    def _deliver(self, lane: _SinkLane, batch: List[Notification]) -> None:
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    lane.sink.send(batch)
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        print(f"Error delivering {len(batch)} notifications to {lane.sink.name}: {e}")
+                        with self._lock:
+                            self.failed += len(batch)
+                        return
+                    with self._lock:
+                        self.retries += 1
+                    # exponential backoff with jitter so retries don't arrive in lockstep
+                    time.sleep(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.0))
+                    continue
+                now = time.time()
+                with self._lock:
+                    self.delivered += len(batch)
+                    # lag from when the notification could first have gone out
+                    self._lags.extend(now - max(n.due.timestamp(), n.submitted) for n in batch)
+                return
+        finally:
+            lane.slots.release()
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import List, Sequence, Tuple
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; callers fall back to the scalar rules
+    np = None
+
+DAILY, WEEKLY, MONTHLY, YEARLY = 0, 1, 2, 3
+
+TYPE_CODES = {
+    RecurrenceType.DAILY: DAILY,
+    RecurrenceType.WEEKLY: WEEKLY,
+    RecurrenceType.MONTHLY: MONTHLY,
+    RecurrenceType.YEARLY: YEARLY,
+}
+
+class RecurrenceBatch:
+    '''
+    Columnar view over many recurrence rules: type codes, intervals and
+    anchors as NumPy arrays, so next occurrences for every rule come out of
+    a handful of array operations instead of one Python call per rule.
+    Month-end and leap-day clamping match RecurrenceRule.occurrence.
+    '''
+    def __init__(self, types, intervals, anchors):
+        if np is None:
+            raise ImportError("RecurrenceBatch requires numpy")
+        self.types = np.asarray(types, dtype=np.int8)
+        self.intervals = np.asarray(intervals, dtype=np.int64)
+        self.anchors = np.asarray(anchors, dtype="datetime64[s]")
+        days = self.anchors.astype("datetime64[D]")
+        months = self.anchors.astype("datetime64[M]")
+        self._time_of_day = self.anchors - days
+        self._anchor_day = (days - months.astype("datetime64[D]")).astype(np.int64)  # 0-based
+        self._anchor_month = months.astype(np.int64)  # months since 1970-01
+        fixed_days = np.where(self.types == WEEKLY, 7, 1) * self.intervals
+        self._step_seconds = fixed_days * 86400
+        self._step_months = np.where(self.types == YEARLY, 12, 1) * self.intervals
+        self._calendar = (self.types == MONTHLY) | (self.types == YEARLY)
+
+    @classmethod
+    def from_rules(cls, rules: Sequence[RecurrenceRule], anchors: Sequence[datetime]) -> "RecurrenceBatch":
+        return cls(
+            [TYPE_CODES[rule.type] for rule in rules],
+            [rule.interval for rule in rules],
+            [rule.anchor or anchor for rule, anchor in zip(rules, anchors)],
+        )
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def occurrence(self, n, rows=None):
+        # the n-th occurrence of every rule, or of the selected rows only
+        sel = slice(None) if rows is None else rows
+        n = np.asarray(n, dtype=np.int64)
+        fixed = self.anchors[sel] + (n * self._step_seconds[sel]).astype("timedelta64[s]")
+        month = self._anchor_month[sel] + n * self._step_months[sel]
+        month_start = month.astype("datetime64[M]").astype("datetime64[D]")
+        month_len = ((month + 1).astype("datetime64[M]").astype("datetime64[D]") - month_start).astype(np.int64)
+        day = np.minimum(self._anchor_day[sel], month_len - 1)
+        calendar = (month_start + day.astype("timedelta64[D]")).astype("datetime64[s]") + self._time_of_day[sel]
+        return np.where(self._calendar[sel], calendar, fixed)
+
+    def first_index_at_or_after(self, when):
+        # smallest n with occurrence(n) >= when, per rule
+        when = np.asarray(when, dtype="datetime64[s]")
+        elapsed = (when - self.anchors).astype(np.int64)
+        fixed = -(-elapsed // self._step_seconds)
+        months = when.astype("datetime64[M]").astype(np.int64) - self._anchor_month
+        calendar = months // self._step_months
+        n = np.maximum(np.where(self._calendar, calendar, fixed), 0)
+        # clamping can leave the calendar estimate one step short
+        return n + (self.occurrence(n) < when)
+
+    def next_occurrences(self, after):
+        # first occurrence strictly after the given time, per rule
+        after = np.asarray(after, dtype="datetime64[s]") + np.timedelta64(1, "s")
+        return self.occurrence(self.first_index_at_or_after(after))
+
+    def occurrences_between(self, start, end) -> Tuple["np.ndarray", "np.ndarray"]:
+        # (rule index, occurrence) pairs for every occurrence in [start, end)
+        end = np.datetime64(end, "s")
+        rows = np.arange(len(self))
+        n = self.first_index_at_or_after(np.datetime64(start, "s"))
+        indices, values = [], []
+        # one pass per step, over the rules that still have occurrences left
+        while len(rows):
+            current = self.occurrence(n, rows)
+            inside = current < end
+            rows, n = rows[inside], n[inside] + 1
+            indices.append(rows)
+            values.append(current[inside])
+        return np.concatenate(indices), np.concatenate(values)
+
+def next_occurrences(rules: Sequence[RecurrenceRule], anchors: Sequence[datetime], after: datetime) -> List[datetime]:
+    # vectorized when numpy is available, one rule at a time otherwise
+    if np is None:
+        return [RecurrenceRule(rule.type, rule.interval, rule.anchor or anchor).get_next_occurrence(after)
+                for rule, anchor in zip(rules, anchors)]
+    batch = RecurrenceBatch.from_rules(rules, anchors)
+    return batch.next_occurrences(np.datetime64(after, "s")).astype("datetime64[us]").tolist()
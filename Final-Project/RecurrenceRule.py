@@ -1,7 +1,9 @@
+import calendar
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional
+from typing import Iterator, List, Optional
+from Metrics import metrics
 
 class RecurrenceType(Enum):
     DAILY = "day"
@@ -9,25 +11,85 @@ class RecurrenceType(Enum):
     MONTHLY = "month"
     YEARLY = "year"
 
-@dataclass
+def add_months(date: datetime, months: int) -> datetime:
+    # clamps to the last day of the target month (Jan 31 + 1 month -> Feb 28/29)
+    total = date.month - 1 + months
+    year = date.year + total // 12
+    month = total % 12 + 1
+    day = min(date.day, calendar.monthrange(year, month)[1])
+    return date.replace(year=year, month=month, day=day)
+
+@dataclass(slots=True)
 class RecurrenceRule:
     type: RecurrenceType
     interval: int = 1  # e.g., every 2 days, every 3 weeks
-    
-    def get_next_occurrence(self, from_date: datetime) -> datetime:
+    # first occurrence of the series; later ones are computed from it so
+    # month-end clamping does not drift (Jan 31 -> Feb 28 -> Mar 31)
+    anchor: Optional[datetime] = None
+
+    def __post_init__(self):
+        # zero would divide by zero below and a negative step never reaches its target
+        if self.interval < 1:
+            raise ValueError(f"interval must be at least 1, got {self.interval}")
+
+    def occurrence(self, n: int, anchor: Optional[datetime] = None) -> datetime:
+        # the n-th occurrence counting the anchor as 0, in O(1)
+        anchor = anchor or self.anchor
         if self.type == RecurrenceType.DAILY:
-            return from_date + timedelta(days=self.interval)
+            return anchor + timedelta(days=n * self.interval)
         elif self.type == RecurrenceType.WEEKLY:
-            return from_date + timedelta(weeks=self.interval)
+            return anchor + timedelta(weeks=n * self.interval)
         elif self.type == RecurrenceType.MONTHLY:
-            # Add months by manipulating the month component
-            year = from_date.year + ((from_date.month + self.interval - 1) // 12)
-            month = ((from_date.month + self.interval - 1) % 12) + 1
-            return from_date.replace(year=year, month=month)
+            return add_months(anchor, n * self.interval)
         elif self.type == RecurrenceType.YEARLY:
-            return from_date.replace(year=from_date.year + self.interval)
+            return add_months(anchor, 12 * n * self.interval)
+
+    def _index_at_or_after(self, anchor: datetime, when: datetime) -> int:
+        # smallest n whose occurrence is >= when, found arithmetically
+        if when <= anchor:
+            return 0
+        if self.type in (RecurrenceType.DAILY, RecurrenceType.WEEKLY):
+            step = timedelta(days=self.interval * (7 if self.type == RecurrenceType.WEEKLY else 1))
+            return -((anchor - when) // step)
+        months = (when.year - anchor.year) * 12 + when.month - anchor.month
+        if self.type == RecurrenceType.YEARLY:
+            months -= months % 12
+        n = max(0, months // (self.interval * (12 if self.type == RecurrenceType.YEARLY else 1)))
+        # clamping can leave the estimate at most one step short
+        while self.occurrence(n, anchor) < when:
+            n += 1
+        return n
+
+    def get_next_occurrence(self, from_date: datetime) -> datetime:
+        if metrics.enabled:
+            return self._next_occurrence_measured(from_date)
+        anchor = self.anchor or from_date
+        return self.occurrence(self._index_at_or_after(anchor, from_date + timedelta(microseconds=1)), anchor)
+
+    def _next_occurrence_measured(self, from_date: datetime) -> datetime:
+        metrics.inc("recurrence_next_occurrence_total", type=self.type.value)
+        with metrics.timer("recurrence_next_occurrence_seconds", type=self.type.value):
+            anchor = self.anchor or from_date
+            return self.occurrence(self._index_at_or_after(anchor, from_date + timedelta(microseconds=1)), anchor)
+
+    def occurrences(self, anchor: Optional[datetime] = None, after: Optional[datetime] = None) -> Iterator[datetime]:
+        # lazily yields the series, optionally skipping straight past a given time
+        anchor = anchor or self.anchor
+        n = self._index_at_or_after(anchor, after) if after else 0
+        while True:
+            yield self.occurrence(n, anchor)
+            n += 1
+
+    def occurrences_between(self, start: datetime, end: datetime, anchor: Optional[datetime] = None) -> List[datetime]:
+        # occurrences in [start, end)
+        result = []
+        for occurrence in self.occurrences(anchor, after=start):
+            if occurrence >= end:
+                break
+            result.append(occurrence)
+        return result
             
     def __str__(self) -> str:
         if self.interval == 1:
             return f"Every {self.type.value}"
-        return f"Every {self.interval} {self.type.value}s"
\ No newline at end of file
+        return f"Every {self.interval} {self.type.value}s"
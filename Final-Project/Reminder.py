@@ -1,9 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
+import uuid
 from RecurrenceRule import RecurrenceRule
 
-@dataclass
+@dataclass(slots=True)
 class Reminder:
     title: str
     datetime: datetime
@@ -11,6 +12,8 @@ class Reminder:
     is_recurring: bool = False
     recurrence_rule: Optional[RecurrenceRule] = None
     completed: bool = False
+    # stable identifier used by the storage journal
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
     
     def __str__(self) -> str:
         status = "[X]" if self.completed else "[]"
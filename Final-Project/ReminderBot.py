@@ -1,20 +1,233 @@
+import os
+import threading
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
-from ReminderManager import ReminderManager
+from typing import Generator, List, Optional
+from Metrics import CommandProfiler, metrics
+from ReminderManager import ReminderManager, ReminderShards
 from Reminder import Reminder
 from User import User, UserService
 from RecurrenceRule import RecurrenceRule, RecurrenceType
 from TimeParser import TimeParser
-from NotificationService import NotificationService
 from Scheduler import Scheduler
+from StorageService import StorageService
+
+# reminders listed per page in the menus
+PAGE_SIZE = 20
+
+COMMANDS = ["Add reminder", "List all reminders", "Mark reminder as completed", "Remove reminder",
+            "Search reminders", "Logout", "Exit"]
+
+RECURRENCE_CHOICES = {
+    "1": RecurrenceType.DAILY,
+    "2": RecurrenceType.WEEKLY,
+    "3": RecurrenceType.MONTHLY,
+    "4": RecurrenceType.YEARLY,
+}
+
+# The menu dialogs below are shared by this client and the asyncio one in
+# AsyncReminderBot. Each is a generator that yields a prompt and is sent
+# the user's answer, or yields a PageRequest and is sent (page, lines);
+# each client drives them with its own input and storage calls.
+
+@dataclass
+class PageRequest:
+    after: Optional[str] = None
+    before: Optional[str] = None
+    pending_only: bool = False
+
+Dialog = Generator[object, object, object]
+
+def print_menu(username: Optional[str]) -> None:
+    print("\nReminder Bot")
+    print(f"Current user: {username or 'Not logged in'}")
+    print("\nCommands:")
+    for i, command in enumerate(COMMANDS if username else ["Login", "Exit"], 1):
+        print(f"{i}. {command}")
+
+def reminder_form(title_prompt: str = "Enter reminder title: ", recurrence: bool = True) -> Dialog:
+    # returns (title, date_str, description, recurrence_rule)
+    title = yield title_prompt
+    date_str = yield "Enter date and time (YYYY-MM-DD HH:MM): "
+    description = yield "Enter description (optional): "
+    recurrence_rule = None
+    if recurrence and (yield "Should this reminder recur? (y/n): ").lower() == 'y':
+        print("\nRecurrence Options:")
+        print("1. Daily")
+        print("2. Weekly")
+        print("3. Monthly")
+        print("4. Yearly")
+        try:
+            type_choice = yield "Choose recurrence type (1-4): "
+            interval = int((yield "Enter interval (e.g., every X days/weeks/etc): "))
+            if type_choice in RECURRENCE_CHOICES:
+                recurrence_rule = RecurrenceRule(type=RECURRENCE_CHOICES[type_choice], interval=interval)
+        except ValueError:
+            print("Invalid interval. Creating reminder without recurrence.")
+    return title, date_str, description, recurrence_rule
+
+def search_form() -> Dialog:
+    # returns (query, pending_only)
+    query = yield "Search for: "
+    pending_only = (yield "Pending reminders only? (y/n): ").lower() == 'y'
+    return query, pending_only
+
+def print_matches(lines: List[str]) -> None:
+    if not lines:
+        print("No matching reminders.")
+        return
+    for i, line in enumerate(lines, 1):
+        print(f"{i}. {line}")
+    if len(lines) == PAGE_SIZE:
+        print(f"(showing the first {PAGE_SIZE} matches; refine the search to narrow it down)")
+
+def browse_dialog(pending_only: bool = False, prompt: Optional[str] = None) -> Dialog:
+    # shows PAGE_SIZE reminders at a time, numbered across pages; with a
+    # prompt, the user picks one by number and it is returned
+    page, lines = yield PageRequest(pending_only=pending_only)
+    while True:
+        for i, line in enumerate(lines, page.offset + 1):
+            print(f"{i}. {line}")
+        moves = (["n: next page"] if page.next_cursor else []) + (["p: previous page"] if page.prev_cursor else [])
+        if prompt is None and not moves:
+            return None
+        if moves:
+            print(f"({page.offset + 1}-{page.offset + len(page.reminders)} of {page.total}; {', '.join(moves)})")
+        answer = (yield prompt or "Press Enter to go back: ").strip().lower()
+        if answer == "n" and page.next_cursor:
+            page, lines = yield PageRequest(after=page.next_cursor, pending_only=pending_only)
+        elif answer == "p" and page.prev_cursor:
+            page, lines = yield PageRequest(before=page.prev_cursor, pending_only=pending_only)
+        elif prompt is None:
+            return None
+        else:
+            try:
+                idx = int(answer) - 1
+            except ValueError:
+                print("Invalid input. Please enter a number.")
+                return None
+            if page.offset <= idx < page.offset + len(page.reminders):
+                return page.reminders[idx - page.offset]
+            print("Invalid reminder number.")
+            return None
 
 class ReminderBot:
-    def __init__(self):
-        self.reminder_manager = ReminderManager()
-        self.user_service = UserService()
-        self.time_parser = TimeParser() # integrate
-        self.notification_service = NotificationService() # implement
-        self.scheduler = Scheduler() # implement
+    def __init__(self, storage_backend: str = "json"):
+        # reminders are sharded per user and loaded when that user logs in
+        storage_factory = None
+        if storage_backend == "sqlite":
+            from SQLiteStorageService import SQLiteStorageService
+            storage_factory = lambda username: SQLiteStorageService(username=username)
+        elif storage_backend == "binary":
+            storage_factory = lambda username: StorageService(username=username, snapshot_format="binary")
+        self.shards = ReminderShards(storage_factory=storage_factory)
+        self.user_service = UserService(on_login=self.handle_user_loaded)
+        # the parser, scheduler and notification pipeline are built on first
+        # use, so the first menu shows without waiting for any of them
+        self._time_parser: Optional[TimeParser] = None
+        self._scheduler: Optional[Scheduler] = None
+        self._notification_service = None
+        self._subsystem_lock = threading.Lock()
+        # set by shutdown(): nothing is built after it, so nothing outlives it
+        self._closed = False
+        self._warm_ups: List[threading.Thread] = []
+        # serializes arming a freshly loaded user against logging out
+        self._login_lock = threading.Lock()
+        # REMINDER_PROFILE=cprofile|sample profiles every handle_* command
+        self.profiler = None
+        if os.environ.get("REMINDER_PROFILE"):
+            self.profiler = CommandProfiler(os.environ["REMINDER_PROFILE"])
+            self.profiler.wrap(self)
+
+    @property
+    def reminder_manager(self) -> ReminderManager:
+        return self.shards.get(self.get_current_user().username)
+
+    @property
+    def time_parser(self) -> TimeParser:
+        if self._time_parser is None:
+            self._time_parser = TimeParser()
+        return self._time_parser
+
+    @property
+    def scheduler(self) -> Scheduler:
+        with self._subsystem_lock:
+            if self._scheduler is None:
+                if self._closed:
+                    raise RuntimeError("the reminder bot has been shut down")
+                scheduler = Scheduler(callback=self.handle_due_reminders)
+                scheduler.start()
+                self._scheduler = scheduler
+            return self._scheduler
+
+    @property
+    def notification_service(self):
+        # due reminders are batched and delivered off the scheduler thread;
+        # the pipeline (thread pool, HTTP client) is imported with the first one
+        with self._subsystem_lock:
+            if self._notification_service is None:
+                # after shutdown only a scheduler still stopping may ask for one
+                if self._closed and self._scheduler is None:
+                    raise RuntimeError("the reminder bot has been shut down")
+                from NotificationService import ConsoleSink, NotificationService
+                self._notification_service = NotificationService(sinks=[ConsoleSink()])
+            return self._notification_service
+
+    def handle_user_loaded(self, user: User) -> None:
+        # the shard loads in the background so the menu is back right away;
+        # a command that needs it meanwhile waits in ReminderShards.get
+        thread = threading.Thread(target=self._warm_up, args=(user.username,), name="ShardLoader", daemon=True)
+        with self._subsystem_lock:
+            if self._closed:
+                return
+            self._warm_ups = [t for t in self._warm_ups if t.is_alive()] + [thread]
+            thread.start()
+
+    def _warm_up(self, username: str) -> None:
+        try:
+            manager = self.shards.get(username)
+        except IOError:
+            # an unreadable snapshot: the first command that needs the shard reports it
+            return
+        with self._login_lock:
+            user = self.get_current_user()
+            # the user may have logged out (or switched) while we were loading
+            if user is not None and user.username == username:
+                try:
+                    self.scheduler.arm_all(manager.get_pending_reminders())
+                except RuntimeError:
+                    # shut down while we were loading
+                    pass
+
+    def handle_due_reminders(self, reminders: List[Reminder]) -> None:
+        # called from the scheduler thread
+        user = self.get_current_user()
+        self.notification_service.notify(reminders, user.username if user else None)
+
+    def shutdown(self) -> None:
+        # nothing is built from here on, so only what was started needs stopping;
+        # a shard still loading in the background finishes first
+        with self._subsystem_lock:
+            self._closed = True
+            warm_ups, self._warm_ups = self._warm_ups, []
+        for thread in warm_ups:
+            thread.join()
+        with self._subsystem_lock:
+            scheduler = self._scheduler
+        if scheduler is not None:
+            # reminders it fires until it has stopped are still delivered
+            scheduler.stop()
+        with self._subsystem_lock:
+            self._scheduler = None
+            notification_service, self._notification_service = self._notification_service, None
+        if notification_service is not None:
+            notification_service.stop()
+        self.shards.close()
+        # REMINDER_METRICS_FILE / REMINDER_PROFILE_FILE say where to leave the results
+        if metrics.enabled and os.environ.get("REMINDER_METRICS_FILE"):
+            metrics.dump(os.environ["REMINDER_METRICS_FILE"])
+        if self.profiler and os.environ.get("REMINDER_PROFILE_FILE"):
+            self.profiler.dump(os.environ["REMINDER_PROFILE_FILE"])
 
     def handle_login(self) -> None:
         username = input("Enter username: ")
@@ -37,43 +250,30 @@ class ReminderBot:
         return self.user_service.get_current_user()
     
     def logout(self) -> None:
-        self.user_service.logout()
+        with self._login_lock:
+            if self._scheduler is not None:
+                self._scheduler.clear()
+            self.user_service.logout()
         print("Logged out successfully")
     
+    def run_dialog(self, dialog: Dialog):
+        # drives a menu dialog with input() and the current user's shard
+        reply = None
+        try:
+            while True:
+                request = dialog.send(reply)
+                if isinstance(request, PageRequest):
+                    manager = self.reminder_manager
+                    page = manager.page(after=request.after, before=request.before, limit=PAGE_SIZE,
+                                        pending_only=request.pending_only)
+                    reply = (page, manager.render(page.reminders))
+                else:
+                    reply = input(request)
+        except StopIteration as done:
+            return done.value
+
     def handle_add_reminder(self) -> None:
-        title = input("Enter reminder title: ")
-        date_str = input("Enter date and time (YYYY-MM-DD HH:MM): ")
-        description = input("Enter description (optional): ")
-        
-        recur = input("Should this reminder recur? (y/n): ").lower()
-        recurrence_rule = None
-        
-        if recur == 'y':
-            print("\nRecurrence Options:")
-            print("1. Daily")
-            print("2. Weekly")
-            print("3. Monthly")
-            print("4. Yearly")
-            
-            try:
-                type_choice = input("Choose recurrence type (1-4): ")
-                interval = int(input("Enter interval (e.g., every X days/weeks/etc): "))
-                
-                type_map = {
-                    "1": RecurrenceType.DAILY,
-                    "2": RecurrenceType.WEEKLY,
-                    "3": RecurrenceType.MONTHLY,
-                    "4": RecurrenceType.YEARLY
-                }
-                
-                if type_choice in type_map:
-                    recurrence_rule = RecurrenceRule(
-                        type=type_map[type_choice],
-                        interval=interval
-                    )
-            except ValueError:
-                print("Invalid interval. Creating reminder without recurrence.")
-        
+        title, date_str, description, recurrence_rule = self.run_dialog(reminder_form())
         if self.create_reminder(title, date_str, description, recurrence_rule):
             print("Reminder added successfully!")
         else:
@@ -84,104 +284,72 @@ class ReminderBot:
             print("Please log in first.")
             return False
         
-        try:
-            reminder_datetime = datetime.strptime(date_str, "%Y-%m-%d %H:%M")
-            reminder = Reminder(
-                title=title,
-                datetime=reminder_datetime,
-                description=description,
-                recurrence_rule=recurrence_rule
-            )
-            self.reminder_manager.add_reminder(reminder)
-            return True
-        except ValueError:
+        reminder_datetime = self.time_parser.parse(date_str)
+        if reminder_datetime is None:
             return False
+        reminder = Reminder(
+            title=title,
+            datetime=reminder_datetime,
+            description=description,
+            recurrence_rule=recurrence_rule
+        )
+        self.reminder_manager.add_reminder(reminder)
+        self.scheduler.arm(reminder)
+        return True
         
+    def browse_reminders(self, pending_only: bool = False, prompt: Optional[str] = None) -> Optional[Reminder]:
+        return self.run_dialog(browse_dialog(pending_only, prompt))
+
     def handle_list_reminders(self) -> None:
-        reminders = self.reminder_manager.get_all_reminders()
-        if not reminders:
+        if not self.reminder_manager.page(limit=1).reminders:
             print("No reminders found.")
         else:
-            for i, reminder in enumerate(reminders, 1):
-                print(f"{i}. {reminder}")
+            self.browse_reminders()
+
+    def handle_search_reminders(self) -> None:
+        query, pending_only = self.run_dialog(search_form())
+        reminders = self.reminder_manager.search(query, pending_only=pending_only, limit=PAGE_SIZE)
+        print_matches(self.reminder_manager.render(reminders))
 
     def handle_mark_completed(self) -> None:
-        reminders = self.reminder_manager.get_pending_reminders()
-        if not reminders:
+        if not self.reminder_manager.pending_count():
             print("No pending reminders.")
             return
             
         print("Pending reminders:")
-        for i, reminder in enumerate(reminders, 1):
-            print(f"{i}. {reminder}")
-        
-        try:
-            idx = int(input("Enter reminder number to mark as completed: ")) - 1
-            if 0 <= idx < len(reminders):
-                reminder = reminders[idx]
-                self.reminder_manager.mark_completed(reminder)
-                print("Reminder marked as completed!")
-                if reminder.recurrence_rule:
-                    next_datetime = reminder.recurrence_rule.get_next_occurrence(reminder.datetime)
-                    new_reminder = Reminder(
-                        title=reminder.title,
-                        datetime=next_datetime,
-                        description=reminder.description,
-                        recurrence_rule=reminder.recurrence_rule
-                    )
-                    self.reminder_manager.add_reminder(new_reminder)
-                    print(f"Next occurrence scheduled for: {next_datetime.strftime('%Y-%m-%d %H:%M')}")
-                
-                follow_up = input("\nWould you like to schedule a follow-up task? (y/n): ").lower()
-                if follow_up == 'y':
-                    print("\nCreating follow-up task...")
-                    title = input("Enter follow-up task title: ")
-                    date_str = input("Enter date and time (YYYY-MM-DD HH:MM): ")
-                    description = input("Enter description (optional): ")
-                    
-                    if self.create_reminder(title, date_str, description if description else None):
-                        print("Follow-up task added successfully!")
-                    else:
-                        print("Failed to add follow-up task. Please check the date format.")
+        reminder = self.browse_reminders(pending_only=True, prompt="Enter reminder number to mark as completed: ")
+        if reminder:
+            self.reminder_manager.mark_completed(reminder)
+            print("Reminder marked as completed!")
+            if reminder.recurrence_rule:
+                # the series record now points at its next occurrence
+                self.scheduler.arm(reminder)
+                print(f"Next occurrence scheduled for: {reminder.datetime.strftime('%Y-%m-%d %H:%M')}")
             else:
-                print("Invalid reminder number.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+                self.scheduler.cancel(reminder.id)
+
+            follow_up = input("\nWould you like to schedule a follow-up task? (y/n): ").lower()
+            if follow_up == 'y':
+                print("\nCreating follow-up task...")
+                title, date_str, description, _ = self.run_dialog(
+                    reminder_form("Enter follow-up task title: ", recurrence=False))
+                if self.create_reminder(title, date_str, description if description else None):
+                    print("Follow-up task added successfully!")
+                else:
+                    print("Failed to add follow-up task. Please check the date format.")
 
     def handle_remove_reminder(self) -> None:
-        reminders = self.reminder_manager.get_all_reminders()
-        if not reminders:
+        if not self.reminder_manager.page(limit=1).reminders:
             print("No reminders to remove.")
             return
             
         print("All reminders:")
-        for i, reminder in enumerate(reminders, 1):
-            print(f"{i}. {reminder}")
-        
-        try:
-            idx = int(input("Enter reminder number to remove: ")) - 1
-            if 0 <= idx < len(reminders):
-                self.reminder_manager.remove_reminder(reminders[idx])
-                print("Reminder removed successfully!")
-            else:
-                print("Invalid reminder number.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+        reminder = self.browse_reminders(prompt="Enter reminder number to remove: ")
+        if reminder:
+            self.reminder_manager.remove_reminder(reminder)
+            self.scheduler.cancel(reminder.id)
+            print("Reminder removed successfully!")
 
     def display_menu(self) -> None:
         current_user = self.get_current_user()
-        print("\nReminder Bot")
-        print(f"Current user: {current_user.username if current_user else 'Not logged in'}")
-        
-        if not current_user:
-            print("\nCommands:")
-            print("1. Login")
-            print("2. Exit")
-        else:
-            print("\nCommands:")
-            print("1. Add reminder")
-            print("2. List all reminders")
-            print("3. Mark reminder as completed")
-            print("4. Remove reminder")
-            print("5. Logout")
-            print("6. Exit")
\ No newline at end of file
+        print_menu(current_user.username if current_user else None)
@@ -1,29 +1,406 @@
-from typing import List
+import base64
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from Metrics import SIZE_BUCKETS, metrics
 from Reminder import Reminder
+from SearchIndex import SearchIndex
 from StorageService import StorageService
 
+def _sort_key(reminder: Reminder):
+    # id breaks ties so every reminder has a unique position
+    return (reminder.datetime, reminder.id)
+
+def encode_cursor(key: Tuple[datetime, str]) -> str:
+    # opaque, URL-safe form of a (datetime, id) position
+    return base64.urlsafe_b64encode(f"{key[0].isoformat()}|{key[1]}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        when, reminder_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(when), reminder_id
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+@dataclass
+class Page:
+    reminders: List[Reminder]
+    offset: int  # position of the first reminder in the whole list
+    total: int
+    next_cursor: Optional[str] = None  # None on the last page
+    prev_cursor: Optional[str] = None  # None on the first page
+
+def _synchronized(method):
+    # runs the method under the manager's lock, after picking up anything
+    # other processes wrote; each user has their own manager, so users
+    # never contend with each other
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            if self.closed:
+                # evicted or unloaded: its storage is closed and a newer manager may own the file
+                raise RuntimeError(f"reminders of {self.username!r} were unloaded; get the manager again")
+            if metrics.enabled:
+                return _measured(method, self, *args, **kwargs)
+            self._refresh()
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def _measured(method, manager, *args, **kwargs):
+    # per-operation latency and the size of the list it worked on
+    begin = time.perf_counter()
+    manager._refresh()
+    try:
+        return method(manager, *args, **kwargs)
+    finally:
+        metrics.observe("reminder_manager_op_seconds", time.perf_counter() - begin, op=method.__name__)
+        metrics.observe("reminder_manager_list_size", len(manager.reminders), SIZE_BUCKETS, op=method.__name__)
+
 class ReminderManager:
-    def __init__(self):
-        self.storage = StorageService()
+    def __init__(self, username: Optional[str] = None, storage=None):
+        self.username = username
+        # any backend with the StorageService interface (JSON journal or SQLite)
+        self.storage = storage or StorageService(username=username)
+        self.last_used = time.monotonic()
+        # callers holding it through ReminderShards.acquire; guarded by the shards' lock
+        self.users = 0
+        self.closed = False
+        self.lock = threading.RLock()
+        try:
+            self._load()
+        except Exception:
+            self.storage.close()
+            raise
+
+    def _load(self) -> None:
         self.reminders: List[Reminder] = self.storage.load_reminders()
+        with metrics.timer("reminder_manager_sort_seconds", op="load"):
+            self.reminders.sort(key=_sort_key)
+        # id -> reminder, and the pending subset kept in due-time order
+        self._by_id: Dict[str, Reminder] = {r.id: r for r in self.reminders}
+        self._pending: List[Reminder] = [r for r in self.reminders if not r.completed]
+        # pending recurring reminders, each standing for its whole series
+        self._series: Dict[str, Reminder] = {r.id: r for r in self._pending if r.recurrence_rule}
+        # built on the first search, then kept up to date by _index/_unindex
+        self._search: Optional[SearchIndex] = None
+        # id -> str(reminder) for reminders already shown, dropped on any change
+        self._rendered: Dict[str, str] = {}
     
+    @_synchronized
     def add_reminder(self, reminder: Reminder) -> None:
-        self.reminders.append(reminder)
-        self.reminders.sort(key=lambda x: x.datetime)
-        self.storage.save_reminders(self.reminders)
+        if reminder.recurrence_rule and reminder.recurrence_rule.anchor is None:
+            reminder.recurrence_rule.anchor = reminder.datetime
+        self._index(reminder)
+        self.storage.record_add(reminder)
+        self._compact_if_needed()
     
+    @_synchronized
+    def add_many(self, reminders: List[Reminder]) -> None:
+        # bulk insert: one sort and one storage write for the whole batch
+        for reminder in reminders:
+            if reminder.recurrence_rule and reminder.recurrence_rule.anchor is None:
+                reminder.recurrence_rule.anchor = reminder.datetime
+            self._by_id[reminder.id] = reminder
+            if not reminder.completed and reminder.recurrence_rule:
+                self._series[reminder.id] = reminder
+            if self._search is not None:
+                self._search.add(reminder)
+        with metrics.timer("reminder_manager_sort_seconds", op="add_many"):
+            self.reminders.extend(reminders)
+            self.reminders.sort(key=_sort_key)
+            self._pending.extend(r for r in reminders if not r.completed)
+            self._pending.sort(key=_sort_key)
+        self.storage.record_many(reminders)
+        self._compact_if_needed()
+
+    @_synchronized
     def get_all_reminders(self) -> List[Reminder]:
-        return self.reminders
+        return list(self.reminders)
     
+    @_synchronized
     def get_pending_reminders(self) -> List[Reminder]:
-        return [r for r in self.reminders if not r.completed]
+        return list(self._pending)
+
+    @_synchronized
+    def get_reminder(self, reminder_id: str) -> Optional[Reminder]:
+        return self._by_id.get(reminder_id)
+
+    @_synchronized
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    @_synchronized
+    def next_due(self) -> Optional[Reminder]:
+        return self._pending[0] if self._pending else None
+
+    @_synchronized
+    def due_before(self, when: datetime) -> List[Reminder]:
+        # pending reminders due strictly before the given time
+        end = bisect_left(self._pending, when, key=lambda r: r.datetime)
+        return self._pending[:end]
+
+    @_synchronized
+    def occurrences_between(self, start: datetime, end: datetime) -> List[Tuple[datetime, Reminder]]:
+        # one-off reminders come from the sorted index, series are expanded arithmetically
+        lo = bisect_left(self._pending, start, key=lambda r: r.datetime)
+        hi = bisect_left(self._pending, end, key=lambda r: r.datetime)
+        result = [(r.datetime, r) for r in self._pending[lo:hi] if not r.recurrence_rule]
+        for reminder in self._series.values():
+            rule = reminder.recurrence_rule
+            for occurrence in rule.occurrences_between(max(start, reminder.datetime), end, anchor=rule.anchor or reminder.datetime):
+                result.append((occurrence, reminder))
+        result.sort(key=lambda pair: pair[0])
+        return result
+
+    @_synchronized
+    def page(self, after: Optional[str] = None, before: Optional[str] = None, limit: int = 20,
+             pending_only: bool = False) -> Page:
+        # keyset pagination on (datetime, id): the page right after (or
+        # before) a cursor, so reminders added or removed elsewhere in the
+        # list never shift what the next page shows; O(log n + limit)
+        items = self._pending if pending_only else self.reminders
+        if before is not None:
+            end = bisect_left(items, decode_cursor(before), key=_sort_key)
+            start = max(0, end - limit)
+        else:
+            start = bisect_right(items, decode_cursor(after), key=_sort_key) if after is not None else 0
+            end = min(len(items), start + limit)
+        reminders = items[start:end]
+        page = Page(reminders, start, len(items))
+        if reminders and end < len(items):
+            page.next_cursor = encode_cursor(_sort_key(reminders[-1]))
+        if reminders and start > 0:
+            page.prev_cursor = encode_cursor(_sort_key(reminders[0]))
+        return page
+
+    @_synchronized
+    def render(self, reminders: List[Reminder]) -> List[str]:
+        # display lines for one page, formatting only what isn't cached yet
+        lines = []
+        for reminder in reminders:
+            line = self._rendered.get(reminder.id)
+            if line is None:
+                line = self._rendered[reminder.id] = str(reminder)
+            lines.append(line)
+        return lines
+
+    @_synchronized
+    def search(self, query: str = "", pending_only: bool = False, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, recurring: Optional[bool] = None,
+               limit: Optional[int] = 50) -> List[Reminder]:
+        # reminders whose title or description contain every word of the query
+        # (the last word may be a prefix), in due-time order; the filters
+        # narrow it to pending ones, a [start, end) due range, and recurring
+        # (True) or one-off (False) reminders
+        if self._search is None:
+            with metrics.timer("reminder_manager_index_seconds"):
+                self._search = SearchIndex(self.reminders)
+        def where(reminder: Reminder) -> bool:
+            if pending_only and reminder.completed:
+                return False
+            return recurring is None or (reminder.recurrence_rule is not None) == recurring
+        return self._search.search(query, self._pending if pending_only else self.reminders,
+                                   self._by_id.get, where, start, end, limit)
     
+    @_synchronized
     def mark_completed(self, reminder: Reminder) -> None:
-        if reminder in self.reminders:
-            reminder.completed = True
-            self.storage.save_reminders(self.reminders)
+        reminder = self._by_id.get(reminder.id)
+        if reminder and not reminder.completed:
+            if reminder.recurrence_rule:
+                # a series stays one record and moves on to its next occurrence
+                self._unindex(reminder)
+                reminder.datetime = reminder.recurrence_rule.get_next_occurrence(reminder.datetime)
+                self._index(reminder)
+                self.storage.record_update(reminder)
+            else:
+                self._remove_sorted(self._pending, reminder)
+                self._rendered.pop(reminder.id, None)
+                reminder.completed = True
+                self.storage.record_complete(reminder)
+            self._compact_if_needed()
     
+    @_synchronized
+    def update_reminder(self, reminder: Reminder) -> None:
+        # replaces the stored reminder with the same id, e.g. after a remote change
+        old = self._by_id.get(reminder.id)
+        if old is None:
+            self.add_reminder(reminder)
+            return
+        if reminder.recurrence_rule and reminder.recurrence_rule.anchor is None:
+            reminder.recurrence_rule.anchor = reminder.datetime
+        self._unindex(old)
+        self._index(reminder)
+        self.storage.record_update(reminder)
+        self._compact_if_needed()
+
+    @_synchronized
     def remove_reminder(self, reminder: Reminder) -> None:
-        if reminder in self.reminders:
-            self.reminders.remove(reminder)
-            self.storage.save_reminders(self.reminders)
\ No newline at end of file
+        reminder = self._by_id.get(reminder.id)
+        if reminder:
+            self._unindex(reminder)
+            self.storage.record_remove(reminder)
+            self._compact_if_needed()
+
+    def _index(self, reminder: Reminder) -> None:
+        self._by_id[reminder.id] = reminder
+        self._rendered.pop(reminder.id, None)
+        if self._search is not None:
+            self._search.add(reminder)
+        insort(self.reminders, reminder, key=_sort_key)
+        if not reminder.completed:
+            insort(self._pending, reminder, key=_sort_key)
+            if reminder.recurrence_rule:
+                self._series[reminder.id] = reminder
+
+    def _unindex(self, reminder: Reminder) -> None:
+        del self._by_id[reminder.id]
+        self._rendered.pop(reminder.id, None)
+        if self._search is not None:
+            self._search.remove(reminder)
+        self._remove_sorted(self.reminders, reminder)
+        if not reminder.completed:
+            self._remove_sorted(self._pending, reminder)
+            self._series.pop(reminder.id, None)
+
+    def _remove_sorted(self, items: List[Reminder], reminder: Reminder) -> None:
+        i = bisect_left(items, _sort_key(reminder), key=_sort_key)
+        if i < len(items) and items[i] is reminder:
+            del items[i]
+
+    def _refresh(self) -> None:
+        # applies what other processes sharing the data directory wrote since we last looked
+        changes = self.storage.poll_changes()
+        if changes is None:
+            self._load()
+            return
+        for op, value in changes:
+            if op in ("add", "update"):
+                old = self._by_id.get(value.id)
+                if old:
+                    self._unindex(old)
+                self._index(value)
+            elif op == "complete":
+                reminder = self._by_id.get(value)
+                if reminder and not reminder.completed:
+                    self._remove_sorted(self._pending, reminder)
+                    self._series.pop(reminder.id, None)
+                    self._rendered.pop(reminder.id, None)
+                    reminder.completed = True
+            elif op == "remove" and value in self._by_id:
+                self._unindex(self._by_id[value])
+
+    def _compact_if_needed(self) -> None:
+        # folds the journal into a fresh snapshot once it grows past the threshold;
+        # catching up under the writer lock keeps other processes' writes in it
+        if self.storage.needs_compaction():
+            with self.storage.lock.hold():
+                self._refresh()
+                self.storage.save_reminders(self.reminders)
+
+
+class ReminderShards:
+    # loads a user's reminders the first time they are needed and drops
+    # shards that have been idle too long or exceed the loaded limit
+    def __init__(self, max_loaded: int = 32, idle_timeout: float = 30 * 60,
+                 storage_factory: Optional[Callable[[str], object]] = None, stripes: int = 16):
+        self.storage_factory = storage_factory
+        self.max_loaded = max_loaded
+        self.idle_timeout = idle_timeout
+        self._loaded: "OrderedDict[str, ReminderManager]" = OrderedDict()
+        # _lock guards the dict; loading happens under a per-stripe lock so
+        # different users load in parallel but one user is never loaded twice
+        self._lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+
+    def get(self, username: str) -> ReminderManager:
+        return self._get(username, hold=False)
+
+    def acquire(self, username: str) -> ReminderManager:
+        # like get(), but the shard is not evicted until release()
+        return self._get(username, hold=True)
+
+    def release(self, manager: ReminderManager) -> None:
+        with self._lock:
+            manager.users -= 1
+
+    @contextmanager
+    def using(self, username: str) -> Iterator[ReminderManager]:
+        # holds the user's manager for the length of a request
+        manager = self.acquire(username)
+        try:
+            yield manager
+        finally:
+            self.release(manager)
+
+    def _get(self, username: str, hold: bool) -> ReminderManager:
+        while True:
+            with self._lock:
+                manager = self._loaded.get(username)
+            if manager is None:
+                with self._stripes[hash(username) % len(self._stripes)]:
+                    with self._lock:
+                        manager = self._loaded.get(username)
+                    if manager is None:
+                        storage = self.storage_factory(username) if self.storage_factory else None
+                        manager = ReminderManager(username=username, storage=storage)
+                        with self._lock:
+                            self._loaded[username] = manager
+            with self._lock:
+                # another thread may have evicted it since: never hand out a closed one
+                if self._loaded.get(username) is manager:
+                    self._loaded.move_to_end(username)
+                    manager.last_used = time.monotonic()
+                    if hold:
+                        manager.users += 1
+                    break
+        self.evict_idle()
+        return manager
+
+    def is_loaded(self, username: str) -> bool:
+        with self._lock:
+            return username in self._loaded
+
+    def loaded_count(self) -> int:
+        with self._lock:
+            return len(self._loaded)
+
+    def unload(self, username: str) -> None:
+        with self._lock:
+            manager = self._loaded.pop(username, None)
+        if manager is not None:
+            self._close(manager)
+
+    def _close(self, manager: ReminderManager) -> None:
+        with manager.lock:
+            manager.closed = True
+            manager.storage.close()
+
+    def close(self) -> None:
+        # flushes and closes every loaded shard
+        with self._lock:
+            usernames = list(self._loaded)
+        for username in usernames:
+            self.unload(username)
+
+    def evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = []
+        with self._lock:
+            # least recently used shards sit at the front; ones in use are skipped
+            excess = len(self._loaded) - self.max_loaded
+            for username, manager in list(self._loaded.items()):
+                if excess <= 0 and manager.last_used >= cutoff:
+                    break
+                if manager.users:
+                    continue
+                del self._loaded[username]
+                evicted.append(manager)
+                excess -= 1
+        for manager in evicted:
+            self._close(manager)
@@ -0,0 +1,160 @@
+import struct
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+from BinarySnapshot import uuid_bytes
+from Reminder import Reminder
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+COMPLETED = 1
+RECURRING = 2
+STRING_ID = 4  # the id slot holds an arena index instead of uuid bytes
+
+RULE_TYPES = list(RecurrenceType)
+NO_RULE = -1
+NO_STRING = -1
+NO_ANCHOR = -2 ** 63
+
+def _to_epoch(value: datetime) -> int:
+    # naive datetimes are stored as-is, to the microsecond
+    return (value - EPOCH) // ONE_MICROSECOND
+
+def _from_epoch(microseconds: int) -> datetime:
+    return EPOCH + timedelta(microseconds=microseconds)
+
+def _string_slot(index: int) -> bytes:
+    return struct.pack("<I", index).ljust(16, b"\0")
+
+class ReminderTable:
+    '''
+    Columnar store for large reminder sets. Each field lives in a typed
+    array: datetimes as int64 epoch microseconds, completed/recurring as a
+    flag byte, uuid ids as 16 raw bytes (any other id goes to the arena),
+    and titles/descriptions as indexes into an interned string arena. Rows are turned back into Reminder objects only
+    when they are read.
+    '''
+    def __init__(self, reminders: Iterable[Reminder] = ()):
+        self._ids = bytearray()
+        self._datetimes = array('q')
+        self._flags = array('B')
+        self._titles = array('i')
+        self._descriptions = array('i')
+        self._rule_types = array('b')
+        self._rule_intervals = array('i')
+        self._rule_anchors = array('q')
+        # string arena: each distinct title/description is stored once
+        self._strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+        self.extend(reminders)
+
+    def __len__(self) -> int:
+        return len(self._datetimes)
+
+    def _intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        index = self._string_index.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(value)
+            self._string_index[value] = index
+        return index
+
+    def append(self, reminder: Reminder) -> int:
+        flags = (COMPLETED if reminder.completed else 0) | (RECURRING if reminder.is_recurring else 0)
+        raw_id = uuid_bytes(reminder.id)
+        if raw_id is None:
+            # imported ids (e.g. iCalendar UIDs) are not uuid hex
+            flags |= STRING_ID
+            raw_id = _string_slot(self._intern(reminder.id))
+        self._ids += raw_id
+        self._datetimes.append(_to_epoch(reminder.datetime))
+        self._flags.append(flags)
+        self._titles.append(self._intern(reminder.title))
+        self._descriptions.append(self._intern(reminder.description))
+        rule = reminder.recurrence_rule
+        if rule is None:
+            self._rule_types.append(NO_RULE)
+            self._rule_intervals.append(0)
+            self._rule_anchors.append(NO_ANCHOR)
+        else:
+            self._rule_types.append(RULE_TYPES.index(rule.type))
+            self._rule_intervals.append(rule.interval)
+            self._rule_anchors.append(_to_epoch(rule.anchor) if rule.anchor else NO_ANCHOR)
+        return len(self) - 1
+
+    def extend(self, reminders: Iterable[Reminder]) -> None:
+        for reminder in reminders:
+            self.append(reminder)
+
+    def __getitem__(self, row: int) -> Reminder:
+        if row < 0:
+            row += len(self)
+        rule = None
+        rule_type = self._rule_types[row]
+        if rule_type != NO_RULE:
+            anchor = self._rule_anchors[row]
+            rule = RecurrenceRule(
+                type=RULE_TYPES[rule_type],
+                interval=self._rule_intervals[row],
+                anchor=_from_epoch(anchor) if anchor != NO_ANCHOR else None
+            )
+        description = self._descriptions[row]
+        flags = self._flags[row]
+        return Reminder(
+            title=self._strings[self._titles[row]],
+            datetime=_from_epoch(self._datetimes[row]),
+            description=self._strings[description] if description != NO_STRING else None,
+            is_recurring=bool(flags & RECURRING),
+            recurrence_rule=rule,
+            completed=bool(flags & COMPLETED),
+            id=self._id_at(row, flags)
+        )
+
+    def _id_at(self, row: int, flags: int) -> str:
+        if flags & STRING_ID:
+            return self._strings[struct.unpack_from("<I", self._ids, 16 * row)[0]]
+        return self._ids[16 * row:16 * row + 16].hex()
+
+    def __iter__(self) -> Iterator[Reminder]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def find(self, reminder_id: str) -> Optional[int]:
+        # scans the packed id column; no per-row dict is kept
+        needle = uuid_bytes(reminder_id)
+        string_id = needle is None
+        if string_id:
+            index = self._string_index.get(reminder_id)
+            if index is None:
+                return None
+            needle = _string_slot(index)
+        start = self._ids.find(needle)
+        while start != -1:
+            row = start // 16
+            # a uuid and an arena slot could share bytes; the flag tells them apart
+            if start % 16 == 0 and bool(self._flags[row] & STRING_ID) == string_id:
+                return row
+            start = self._ids.find(needle, start + 1)
+        return None
+
+    def datetime_at(self, row: int) -> datetime:
+        return _from_epoch(self._datetimes[row])
+
+    def is_completed(self, row: int) -> bool:
+        return bool(self._flags[row] & COMPLETED)
+
+    def set_completed(self, row: int, completed: bool = True) -> None:
+        if completed:
+            self._flags[row] |= COMPLETED
+        else:
+            self._flags[row] &= ~COMPLETED & 0xFF
+
+    def nbytes(self) -> int:
+        # size of the column buffers, excluding the string arena
+        columns = (self._datetimes, self._flags, self._titles, self._descriptions,
+                   self._rule_types, self._rule_intervals, self._rule_anchors)
+        return len(self._ids) + sum(column.itemsize * len(column) for column in columns)
@@ -0,0 +1,302 @@
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+from urllib.parse import unquote
+from Reminder import Reminder
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+from StorageService import DEFAULT_DATA_DIR, StorageService
+
+REMINDERS_TABLE = """
+CREATE TABLE IF NOT EXISTS reminders (
+    id TEXT NOT NULL,
+    user TEXT NOT NULL,
+    title TEXT NOT NULL,
+    datetime TEXT NOT NULL,
+    description TEXT,
+    is_recurring INTEGER NOT NULL,
+    rule_type TEXT,
+    rule_interval INTEGER,
+    rule_anchor TEXT,
+    completed INTEGER NOT NULL,
+    -- ids are unique per user only: one user's row never replaces another's
+    PRIMARY KEY (user, id)
+)"""
+
+COLUMNS = "id, user, title, datetime, description, is_recurring, rule_type, rule_interval, rule_anchor, completed"
+
+# PRAGMA user_version of a database with this schema
+SCHEMA_VERSION = 1
+SCHEMA = [
+    REMINDERS_TABLE,
+    "CREATE INDEX IF NOT EXISTS reminders_due ON reminders (user, completed, datetime)",
+    # nothing ever read it: users live in users.json
+    "DROP TABLE IF EXISTS users",
+    "CREATE TABLE IF NOT EXISTS generations (user TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+]
+# version 0 keyed reminders on the id alone and stored datetimes to the second
+UPGRADE_FROM_V0 = [
+    "ALTER TABLE reminders RENAME TO reminders_v0",
+    "DROP INDEX IF EXISTS reminders_due",
+    REMINDERS_TABLE,
+    f"INSERT INTO reminders ({COLUMNS}) SELECT id, user, title, datetime || '.000000', description, is_recurring, "
+    "rule_type, rule_interval, rule_anchor || '.000000', completed FROM reminders_v0",
+    "DROP TABLE reminders_v0",
+]
+
+# statements are kept as constants so sqlite3's statement cache reuses them
+UPSERT = f"INSERT OR REPLACE INTO reminders ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+COMPLETE = "UPDATE reminders SET completed = 1 WHERE id = ? AND user = ?"
+DELETE = "DELETE FROM reminders WHERE id = ? AND user = ?"
+DELETE_USER = "DELETE FROM reminders WHERE user = ?"
+SELECT_USER = f"SELECT {COLUMNS} FROM reminders WHERE user = ? ORDER BY datetime"
+SELECT_DUE = (f"SELECT {COLUMNS} FROM reminders "
+              "WHERE user = ? AND completed = 0 AND datetime >= ? AND datetime < ? ORDER BY datetime")
+COUNT_PENDING = "SELECT COUNT(*) FROM reminders WHERE user = ? AND completed = 0"
+# per-user write counter, so other processes can tell whose reminders changed
+BUMP_GENERATION = ("INSERT INTO generations (user, value) VALUES (?, 1) "
+                   "ON CONFLICT(user) DO UPDATE SET value = value + 1 RETURNING value")
+SELECT_GENERATION = "SELECT value FROM generations WHERE user = ?"
+
+def _format_datetime(value: datetime) -> str:
+    # fixed width so text order matches time order in the index; microseconds
+    # are kept, as in the JSON and binary snapshots
+    return value.isoformat(timespec="microseconds")
+
+class _NoLock:
+    # SQLite locks the database itself; this stands in for StorageService.lock
+    def hold(self, exclusive: bool = True):
+        return nullcontext()
+
+class SQLiteStorageService:
+    '''
+    Drop-in alternative to StorageService backed by one SQLite database in
+    WAL mode. Every user's reminders share the reminders table and the
+    (user, completed, datetime) index turns due-time queries into range scans.
+    '''
+    def __init__(self, storage_file: str = "reminders.db", username: Optional[str] = None,
+                 data_dir: Optional[Path] = None):
+        data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+        data_dir.mkdir(parents=True, exist_ok=True)
+        self.storage_path = data_dir / storage_file
+        self.user = username or ""
+        # the connection may be used from any server thread, one at a time
+        self.connection = sqlite3.connect(self.storage_path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.RLock()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._create_schema()
+        self._batch_depth = 0
+        self.lock = _NoLock()
+        # data_version moves whenever another connection commits; the
+        # generation says whether it touched this user's reminders
+        self._data_version = self._current_data_version()
+        self._generation = self._current_generation()
+        self._stale = False
+
+    def _create_schema(self) -> None:
+        # creates or upgrades the tables; BEGIN IMMEDIATE makes processes that
+        # open an old database together take turns, and only the first upgrades it
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            exists = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reminders'").fetchone()
+            if exists and version == 0:
+                for statement in UPGRADE_FROM_V0:
+                    self.connection.execute(statement)
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        # groups every write inside the block into a single transaction
+        with self._lock:
+            if self._batch_depth == 0:
+                self.connection.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield
+            except Exception:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.connection.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.connection.execute("COMMIT")
+
+    def _row(self, reminder: Reminder) -> Tuple[Any, ...]:
+        rule = reminder.recurrence_rule
+        return (
+            reminder.id,
+            self.user,
+            reminder.title,
+            _format_datetime(reminder.datetime),
+            reminder.description,
+            int(reminder.is_recurring),
+            rule.type.value if rule else None,
+            rule.interval if rule else None,
+            _format_datetime(rule.anchor) if rule and rule.anchor else None,
+            int(reminder.completed),
+        )
+
+    def _reminder(self, row: Tuple[Any, ...]) -> Reminder:
+        rule = None
+        if row[6] is not None:
+            rule = RecurrenceRule(
+                type=RecurrenceType(row[6]),
+                interval=row[7],
+                anchor=datetime.fromisoformat(row[8]) if row[8] else None
+            )
+        return Reminder(
+            title=row[2],
+            datetime=datetime.fromisoformat(row[3]),
+            description=row[4],
+            is_recurring=bool(row[5]),
+            recurrence_rule=rule,
+            completed=bool(row[9]),
+            id=row[0]
+        )
+
+    def _write(self, sql: str, params: Tuple[Any, ...]) -> bool:
+        try:
+            with self.batch():
+                self.connection.execute(sql, params)
+                self._bump_generation()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error writing reminders: {e}")
+            return False
+
+    def record_add(self, reminder: Reminder) -> bool:
+        return self._write(UPSERT, self._row(reminder))
+
+    def record_update(self, reminder: Reminder) -> bool:
+        return self._write(UPSERT, self._row(reminder))
+
+    def record_complete(self, reminder: Reminder) -> bool:
+        return self._write(COMPLETE, (reminder.id, self.user))
+
+    def record_remove(self, reminder: Reminder) -> bool:
+        return self._write(DELETE, (reminder.id, self.user))
+
+    def record_many(self, reminders: List[Reminder]) -> bool:
+        try:
+            with self.batch():
+                self.connection.executemany(UPSERT, [self._row(r) for r in reminders])
+                self._bump_generation()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error writing reminders: {e}")
+            return False
+
+    def needs_compaction(self) -> bool:
+        # every write already lands in place
+        return False
+
+    def _current_data_version(self) -> int:
+        with self._lock:
+            return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def _current_generation(self) -> int:
+        with self._lock:
+            row = self.connection.execute(SELECT_GENERATION, (self.user,)).fetchone()
+        return row[0] if row else 0
+
+    def _bump_generation(self) -> None:
+        # called inside the write's transaction
+        generation = self.connection.execute(BUMP_GENERATION, (self.user,)).fetchone()[0]
+        if generation != self._generation + 1:
+            # someone else wrote this user's reminders since we last looked
+            self._stale = True
+        self._generation = generation
+
+    def poll_changes(self) -> Optional[List]:
+        # None when another process changed this user's reminders (reload them),
+        # otherwise []; one PRAGMA when nothing was committed elsewhere
+        version = self._current_data_version()
+        if version == self._data_version and not self._stale:
+            return []
+        self._data_version = version
+        generation = self._current_generation()
+        if generation == self._generation and not self._stale:
+            return []
+        self._generation = generation
+        self._stale = False
+        return None
+
+    def save_reminders(self, reminders: List[Reminder]) -> bool:
+        try:
+            with self.batch():
+                self.connection.execute(DELETE_USER, (self.user,))
+                self.connection.executemany(UPSERT, [self._row(r) for r in reminders])
+                self._bump_generation()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving reminders: {e}")
+            return False
+
+    def load_reminders(self) -> List[Reminder]:
+        try:
+            with self.batch():
+                rows = self.connection.execute(SELECT_USER, (self.user,)).fetchall()
+                self._generation = self._current_generation()
+                self._stale = False
+            return [self._reminder(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error loading reminders: {e}")
+            return []
+
+    def due_between(self, start: datetime, end: datetime) -> List[Reminder]:
+        # pending reminders due in [start, end), served from the index
+        with self._lock:
+            rows = self.connection.execute(SELECT_DUE, (self.user, _format_datetime(start), _format_datetime(end))).fetchall()
+        return [self._reminder(row) for row in rows]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self.connection.execute(COUNT_PENDING, (self.user,)).fetchone()[0]
+
+    def clear_storage(self) -> bool:
+        return self._write(DELETE_USER, (self.user,))
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
+
+def migrate_json_to_sqlite(data_dir: Optional[Path] = None, legacy_user: Optional[str] = None) -> int:
+    # copies every user's JSON reminder shard into reminders.db; the shared
+    # reminders.json from before per-user shards belongs to no one, so it
+    # is migrated only when legacy_user says whose it is
+    data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+    migrated = 0
+    sources = []
+    if (data_dir / "reminders.json").exists():
+        if legacy_user:
+            sources.append((None, legacy_user))
+        else:
+            print("Warning: skipping the shared reminders.json; pass a username to migrate it to that user")
+    users_dir = data_dir / "users"
+    if users_dir.exists():
+        sources += [(unquote(path.name), unquote(path.name)) for path in users_dir.iterdir() if path.is_dir()]
+    for source, username in sources:
+        reminders = StorageService(username=source, data_dir=data_dir).load_reminders()
+        shard = SQLiteStorageService(username=username, data_dir=data_dir)
+        shard.record_many(reminders)
+        shard.close()
+        migrated += len(reminders)
+    return migrated
+
+if __name__ == "__main__":
+    # usage: python SQLiteStorageService.py [username for the shared reminders.json]
+    print(f"Migrated {migrate_json_to_sqlite(legacy_user=sys.argv[1] if len(sys.argv) > 1 else None)} reminders to SQLite")
@@ -1,4 +1,211 @@
+import heapq
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+from Reminder import Reminder
+
+# asyncio is only imported by AsyncScheduler, so the threaded one starts without it
+if TYPE_CHECKING:
+    import asyncio
+
 class Scheduler:
     '''
-    Implement
-    '''
\ No newline at end of file
+    Fires reminders when they come due. Armed reminders live in a min-heap
+    keyed on due time and a background thread sleeps until the earliest one.
+    Cancelled or re-armed entries are left in the heap and skipped when popped.
+    '''
+    def __init__(self, callback: Optional[Callable[[List[Reminder]], None]] = None):
+        self.callback = callback
+        self._heap: List[Tuple[float, int, str]] = []
+        # reminder id -> (due timestamp, reminder) for entries that are still live
+        self._armed: Dict[str, Tuple[float, Reminder]] = {}
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        # fire-lag metrics, in seconds
+        self.fired_count = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+
+    def arm(self, reminder: Reminder) -> None:
+        with self._cond:
+            self._push(reminder)
+            self._wake()
+
+    def arm_all(self, reminders: Iterable[Reminder]) -> None:
+        # bulk arm: large batches rebuild the heap once instead of pushing one by one
+        reminders = list(reminders)
+        with self._cond:
+            if len(reminders) <= len(self._heap) // 4:
+                for reminder in reminders:
+                    self._push(reminder)
+            else:
+                for reminder in reminders:
+                    self._armed[reminder.id] = (reminder.datetime.timestamp(), reminder)
+                self._heap = [(due, self._next_seq(), rid) for rid, (due, _) in self._armed.items()]
+                heapq.heapify(self._heap)
+            self._wake()
+
+    def cancel(self, reminder_id: str) -> None:
+        with self._cond:
+            self._armed.pop(reminder_id, None)
+            # drop stale heap entries once they outnumber live ones
+            if len(self._heap) > 2 * len(self._armed) + 64:
+                self._heap = [e for e in self._heap if self._is_live(e)]
+                heapq.heapify(self._heap)
+
+    def clear(self) -> None:
+        with self._cond:
+            self._armed.clear()
+            self._heap = []
+
+    def armed_count(self) -> int:
+        return len(self._armed)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="Scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get_metrics(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "armed": len(self._armed),
+                "fired": self.fired_count,
+                "last_lag": self.last_lag,
+                "max_lag": self.max_lag,
+                "mean_lag": self.total_lag / self.fired_count if self.fired_count else 0.0,
+            }
+
+    def _wake(self) -> None:
+        # called with the lock held whenever the earliest deadline may have moved
+        self._cond.notify()
+
+    def _next_deadline(self) -> Optional[float]:
+        # called with the lock held; drops cancelled entries from the top
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _deliver(self, due: List[Reminder]) -> None:
+        if due and self.callback:
+            try:
+                self.callback(due)
+            except Exception as e:
+                print(f"Error delivering reminders: {e}")
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _push(self, reminder: Reminder) -> None:
+        due = reminder.datetime.timestamp()
+        self._armed[reminder.id] = (due, reminder)
+        heapq.heappush(self._heap, (due, self._next_seq(), reminder.id))
+
+    def _is_live(self, entry: Tuple[float, int, str]) -> bool:
+        armed = self._armed.get(entry[2])
+        return armed is not None and armed[0] == entry[0]
+
+    def _pop_due(self, now: float) -> List[Reminder]:
+        # everything already due goes out in one batch, which is also how
+        # reminders missed while the process was down get caught up
+        due: List[Reminder] = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_live(entry):
+                continue
+            _, reminder = self._armed.pop(entry[2])
+            lag = now - entry[0]
+            self.fired_count += 1
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            self.last_lag = lag
+            due.append(reminder)
+        return due
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                deadline = self._next_deadline()
+                if deadline is None:
+                    self._cond.wait()
+                    continue
+                delay = deadline - time.time()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                due = self._pop_due(time.time())
+            self._deliver(due)
+
+
+class AsyncScheduler(Scheduler):
+    '''
+    Same heap as Scheduler, driven by a task on an asyncio loop instead of a
+    thread. The callback may be a plain function or a coroutine function.
+    '''
+    def __init__(self, callback=None):
+        super().__init__(callback)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _wake(self) -> None:
+        super()._wake()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._event.set)
+
+    def start(self) -> None:
+        # must be called from the running loop
+        if self._task is not None:
+            return
+        import asyncio
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._running = True
+        self._task = self._loop.create_task(self._run_async())
+
+    async def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._wake()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        self._loop = None
+
+    async def _run_async(self) -> None:
+        import asyncio
+        while self._running:
+            self._event.clear()
+            with self._cond:
+                deadline = self._next_deadline()
+                delay = None if deadline is None else deadline - time.time()
+                due = self._pop_due(time.time()) if delay is not None and delay <= 0 else []
+            if due:
+                if self.callback and asyncio.iscoroutinefunction(self.callback):
+                    try:
+                        await self.callback(due)
+                    except Exception as e:
+                        print(f"Error delivering reminders: {e}")
+                else:
+                    self._deliver(due)
+                continue
+            try:
+                await asyncio.wait_for(self._event.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,164 @@
+import re
+from bisect import bisect_left, insort
+from datetime import datetime
+from heapq import nsmallest
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from Reminder import Reminder
+
+_TOKEN = re.compile(r"\w+")
+# prefixes matching more tokens than this are checked against each
+# reminder's text while scanning instead of against every posting set
+MAX_EXPANSION = 16
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN.findall(text.casefold()) if text else []
+
+def reminder_tokens(reminder: Reminder) -> Set[str]:
+    text = f"{reminder.title}\n{reminder.description}" if reminder.description else reminder.title
+    return set(_TOKEN.findall(text.casefold()))
+
+def _sort_key(reminder: Reminder):
+    return (reminder.datetime, reminder.id)
+
+def _has_prefix(reminder: Reminder, prefix: str) -> bool:
+    return any(token.startswith(prefix) for token in reminder_tokens(reminder))
+
+class SearchIndex:
+    '''
+    Inverted index over reminder titles and descriptions: token -> ids of
+    the reminders containing it. The tokens are also kept in sorted order,
+    so every token starting with a prefix is one bisect away. Maintained
+    by ReminderManager as reminders come and go.
+    '''
+    def __init__(self, reminders: Iterable[Reminder] = ()):
+        self._postings: Dict[str, Set[str]] = {}
+        self._count = 0
+        postings = self._postings
+        for reminder in reminders:
+            self._count += 1
+            for token in reminder_tokens(reminder):
+                ids = postings.get(token)
+                if ids is None:
+                    ids = postings[token] = set()
+                ids.add(reminder.id)
+        self._tokens: List[str] = sorted(postings)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def add(self, reminder: Reminder) -> None:
+        self._count += 1
+        for token in reminder_tokens(reminder):
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                insort(self._tokens, token)
+            ids.add(reminder.id)
+
+    def remove(self, reminder: Reminder) -> None:
+        self._count -= 1
+        for token in reminder_tokens(reminder):
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(reminder.id)
+            if not ids:
+                del self._postings[token]
+                i = bisect_left(self._tokens, token)
+                if i < len(self._tokens) and self._tokens[i] == token:
+                    del self._tokens[i]
+
+    def expand(self, prefix: str) -> List[str]:
+        # every indexed token starting with prefix
+        lo = bisect_left(self._tokens, prefix)
+        hi = bisect_left(self._tokens, prefix + "\U0010ffff")
+        return self._tokens[lo:hi]
+
+    def _ids(self, term: str, prefix: bool) -> Set[str]:
+        if not prefix:
+            return self._postings.get(term, set())
+        ids: Set[str] = set()
+        for token in self.expand(term):
+            ids |= self._postings[token]
+        return ids
+
+    def _estimate(self, term: str, prefix: bool) -> int:
+        if not prefix:
+            return len(self._postings.get(term, ()))
+        return sum(len(self._postings[token]) for token in self.expand(term))
+
+    def search(self, query: str, ordered: List[Reminder], lookup: Callable[[str], Optional[Reminder]],
+               where: Optional[Callable[[Reminder], bool]] = None, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, limit: Optional[int] = None) -> List[Reminder]:
+        '''
+        Reminders matching every word of the query, the last one as a prefix
+        (search-as-you-type), that also pass `where` and fall in [start, end).
+        `ordered` is the manager's (datetime, id)-sorted list to draw from and
+        results come back in that order, at most `limit` of them.
+
+        Two plans: intersect the posting sets starting from the smallest, or
+        walk `ordered` from `start` filtering chunk by chunk until `limit`
+        match. Assuming the words occur independently, the walk needs about
+        limit / density rows; the intersection touches every id of the
+        smallest set (cheap, it runs in C) and then every match.
+        '''
+        words = tokenize(query)
+        terms = [(word, False) for word in words]
+        if terms and query[-1:].isalnum():
+            terms[-1] = (terms[-1][0], True)
+        lo = bisect_left(ordered, start, key=lambda r: r.datetime) if start else 0
+        hi = bisect_left(ordered, end, key=lambda r: r.datetime) if end else len(ordered)
+        if lo >= hi:
+            return []
+
+        sizes = sorted((self._estimate(term, prefix), term, prefix) for term, prefix in terms)
+        density = 1.0
+        for size, _, _ in sizes:
+            density *= min(size / max(self._count, 1), 1.0)
+        walk = hi - lo if limit is None or density == 0 else min(hi - lo, limit / density)
+        if sizes and walk > sizes[0][0] / 10 + self._count * density:
+            candidates = self._ids(sizes[0][1], sizes[0][2])
+            for _, term, prefix in sizes[1:]:
+                candidates = candidates & self._ids(term, prefix)
+                if not candidates:
+                    return []
+            matches = []
+            for reminder_id in candidates:
+                reminder = lookup(reminder_id)
+                if reminder is None or (start and reminder.datetime < start) or (end and reminder.datetime >= end):
+                    continue
+                if where is None or where(reminder):
+                    matches.append(reminder)
+            if limit is None:
+                return sorted(matches, key=_sort_key)
+            return nsmallest(limit, matches, key=_sort_key)
+
+        # id tests, most selective first; long prefix expansions are checked on the text
+        tests = []
+        scanned_prefixes = []
+        for _, term, prefix in sizes:
+            if not prefix:
+                tests.append(self._postings.get(term, set()).__contains__)
+                continue
+            tokens = self.expand(term)
+            if len(tokens) > MAX_EXPANSION:
+                scanned_prefixes.append(term)
+            else:
+                sets = [self._postings[token] for token in tokens]
+                tests.append(lambda reminder_id, sets=sets: any(reminder_id in ids for ids in sets))
+        matches = []
+        chunk = int(min(max(walk, 64), 1 << 16))
+        while lo < hi:
+            batch = ordered[lo:min(lo + chunk, hi)]
+            lo += chunk
+            for test in tests:
+                batch = [r for r in batch if test(r.id)]
+            for prefix in scanned_prefixes:
+                batch = [r for r in batch if _has_prefix(r, prefix)]
+            if where is not None:
+                batch = [r for r in batch if where(r)]
+            matches += batch
+            if limit is not None and len(matches) >= limit:
+                return matches[:limit]
+            chunk = min(chunk * 2, 1 << 16)
+        return matches
@@ -1,20 +1,226 @@
+import gc
 import json
+import mmap
 import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
+from urllib.parse import quote
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, TextIO, Tuple, Union
 from Reminder import Reminder
 from RecurrenceRule import RecurrenceRule, RecurrenceType
+from Metrics import SIZE_BUCKETS, metrics
+import BinarySnapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, one process per data directory
+    fcntl = None
+
+# the 'data' directory next to the project, unless REMINDER_DATA_DIR says otherwise
+DEFAULT_DATA_DIR = Path(os.environ.get("REMINDER_DATA_DIR") or Path(__file__).parent.parent / 'data')
+
+# snapshots are read in chunks of this many characters
+CHUNK_SIZE = 1 << 20
+MAX_RECORD_SIZE = 16 << 20
+_decoder = json.JSONDecoder()
+
+def iter_json_array(f: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[int, Any]]:
+    # Yields (index, element) for a top-level JSON array without loading the
+    # whole file. A malformed element is yielded as the exception instead and
+    # parsing resumes at the next line that starts a new object.
+    buffer, pos, eof, index = "", 0, False, 0
+    while True:
+        if not eof and len(buffer) - pos < chunk_size:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[":
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                return
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            value, pos = _decoder.raw_decode(buffer, pos)
+        except ValueError as e:
+            # the element may just run past the buffer; read on before giving up
+            if not eof and len(buffer) - pos < MAX_RECORD_SIZE:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+            yield index, e
+            pos = _next_object_line(buffer, pos)
+        else:
+            yield index, value
+        index += 1
+
+def _next_object_line(buffer: str, pos: int) -> int:
+    while True:
+        pos = buffer.find("\n", pos)
+        if pos == -1:
+            return len(buffer)
+        pos += 1
+        line_start = pos
+        while line_start < len(buffer) and buffer[line_start] in " \t":
+            line_start += 1
+        if buffer.startswith("{", line_start):
+            return line_start
+
+def write_atomic(path: Path, content: Union[str, bytes, Iterable[str]]) -> None:
+    # write to a temp file, fsync, then rename over the target so readers
+    # and crashes only ever see the old or the new contents
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open('wb' if isinstance(content, bytes) else 'w') as f:
+        for chunk in ([content] if isinstance(content, (str, bytes)) else content):
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path.parent)
+
+def _fsync_dir(directory: Path) -> None:
+    # makes the rename itself durable; directories can't be opened on Windows
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def file_stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    # (inode, mtime, size): changes whenever the file is rewritten or replaced
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+class SnapshotError(IOError):
+    # the snapshot can't be read as a whole; raised rather than loading an empty
+    # store, which the next compaction would write over the damaged file
+    def __init__(self, path: Path, reason: Exception):
+        super().__init__(f"unreadable snapshot {path}: {reason}")
+        self.path = path
+
+class FileLock:
+    '''
+    Advisory lock on a data file shared by every process using the same
+    data directory: any number of readers or one writer. Re-entrant within
+    a process; a shared hold can't be upgraded, so writers ask for the
+    exclusive lock up front.
+    '''
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+        self._exclusive = False
+
+    @contextmanager
+    def hold(self, exclusive: bool = True) -> Iterator[None]:
+        with self._lock:
+            if self._depth == 0:
+                if self._fd is None:
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                self._exclusive = exclusive
+            elif exclusive and not self._exclusive:
+                raise RuntimeError(f"{self.path.name}: can't upgrade a shared lock")
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and fcntl:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None and self._depth == 0:
+                os.close(self._fd)
+                self._fd = None
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    # a bulk load allocates hundreds of thousands of acyclic objects and the
+    # collector would otherwise rescan them over and over while they pile up
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def legacy_id(position: int, data: Dict[str, Any]) -> str:
+    # records written before ids existed: derived from where the record sits
+    # and what it says, so every load (and every journal entry) agrees on it
+    key = f"{position}:{json.dumps(data, sort_keys=True)}"
+    return uuid.uuid5(uuid.NAMESPACE_URL, key).hex
+
+def user_dir_name(username: str) -> str:
+    # usernames are free text, so escape anything that is not path-safe
+    name = quote(username, safe="")
+    return name if name not in ("", ".", "..") else f"_{name}"
 
 class StorageService:
-    def __init__(self, storage_file: str = "reminders.json"):
-        # Get the directory where the script is located
-        base_dir = Path(__file__).parent.parent
-        # Create a 'data' directory if it doesn't exist
-        data_dir = base_dir / 'data'
-        data_dir.mkdir(exist_ok=True)
-        # Set the full path for the storage file
+    def __init__(self, storage_file: str = "reminders.json", compact_threshold: int = 1000,
+                 username: Optional[str] = None, data_dir: Optional[Path] = None,
+                 commit_window: float = 0.0, snapshot_format: str = "json"):
+        if snapshot_format not in ("json", "binary"):
+            raise ValueError(f"Unknown snapshot format: {snapshot_format}")
+        # Use the 'data' directory next to the project unless told otherwise
+        data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+        if username is not None:
+            # each user gets their own shard under data/users/<username>/
+            data_dir = data_dir / 'users' / user_dir_name(username)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        # Set the full path for the storage file. Binary snapshots keep this
+        # name too: loading tells the formats apart by the magic bytes, so
+        # switching formats is just the next compaction replacing the file,
+        # with no migration, and processes sharing the directory keep
+        # watching the one path (and journal) whichever format is written
         self.storage_path = data_dir / storage_file
+        # Mutations are appended here and folded into the snapshot on compaction
+        self.journal_path = self.storage_path.with_suffix(".journal")
+        self.compact_threshold = compact_threshold
+        # what compaction writes; loading reads either, whatever is on disk
+        self.snapshot_format = snapshot_format
+        self.journal_entries = 0
+        self.snapshot_size = 0
+        self.skipped_records: List[Tuple[str, str]] = []
+        # Other processes may share the data directory: writes take the
+        # exclusive lock, loads the shared one. The snapshot stamp and how far
+        # into the journal we have read tell us cheaply what changed since.
+        self.lock = FileLock(self.storage_path.with_suffix(".lock"))
+        self._snapshot_stamp: Optional[Tuple[int, int, int]] = None
+        self._journal_offset = 0
+        self._own_ranges: List[Tuple[int, int]] = []
+        # Group commit: with a commit window, journal writes are queued and a
+        # background thread flushes everything queued within the window with
+        # one write and one fsync. Without one every append is synced at once.
+        self.commit_window = commit_window
+        self.commits = 0
+        self._queue: List[str] = []
+        self._queued_seq = 0
+        self._durable_seq = 0
+        # why the last group commit failed, until one succeeds again
+        self._commit_error: Optional[Exception] = None
+        self._commit_failures = 0
+        self._commit_cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._closing = False
         self._ensure_storage_exists()
 
     def _ensure_storage_exists(self) -> None:
@@ -27,7 +233,8 @@ class StorageService:
             return None
         return {
             "type": rule.type.value,  # Store the string value of the enum
-            "interval": rule.interval
+            "interval": rule.interval,
+            "anchor": rule.anchor.isoformat() if rule.anchor else None
         }
 
     def _deserialize_recurrence_rule(self, data: Dict[str, Any]) -> Optional[RecurrenceRule]:
@@ -35,7 +242,8 @@ class StorageService:
             return None
         return RecurrenceRule(
             type=RecurrenceType(data["type"]),  # Convert string back to enum
-            interval=data["interval"]
+            interval=data["interval"],
+            anchor=datetime.fromisoformat(data["anchor"]) if data.get("anchor") else None
         )
 
 
@@ -47,43 +255,351 @@ class StorageService:
             "description": reminder.description,
             "is_recurring": reminder.is_recurring,
             "recurrence_rule": self._serialize_recurrence_rule(reminder.recurrence_rule),
-            "completed": reminder.completed
+            "completed": reminder.completed,
+            "id": reminder.id
         }
 
-    def _deserialize_reminder(self, data: Dict[str, Any]) -> Reminder:
+    def _deserialize_reminder(self, data: Dict[str, Any], position: int = 0) -> Reminder:
         # converts dict to Reminder
-        return Reminder(
-            title=data["title"],
-            datetime=datetime.fromisoformat(data["datetime"]),
-            description=data["description"],
-            is_recurring=data["is_recurring"],
-            recurrence_rule=self._deserialize_recurrence_rule(data.get("recurrence_rule")),
-            completed=data["completed"]
-        )
+        fields = {
+            "title": data["title"],
+            "datetime": datetime.fromisoformat(data["datetime"]),
+            "description": data["description"],
+            "is_recurring": data["is_recurring"],
+            "recurrence_rule": self._deserialize_recurrence_rule(data.get("recurrence_rule")),
+            "completed": data["completed"]
+        }
+        # records written before ids existed get a stable one from their position
+        fields["id"] = data["id"] if "id" in data else legacy_id(position, data)
+        return Reminder(**fields)
 
     def save_reminders(self, reminders: List[Reminder]) -> bool:
+        # writes a full snapshot and starts a fresh journal (compaction);
+        # one record per line keeps it valid JSON and cheap to stream back in
+        def snapshot_lines():
+            yield "["
+            for i, reminder in enumerate(reminders):
+                yield ",\n" if i else "\n"
+                yield json.dumps(self._serialize_reminder(reminder))
+            yield "\n]\n"
+
+        begin = time.perf_counter()
         try:
-            reminder_data = [self._serialize_reminder(r) for r in reminders]
-            with self.storage_path.open('w') as f:
-                json.dump(reminder_data, f, indent=2)
+            with self.lock.hold(), self._io_lock:
+                # queued journal entries are already part of the snapshot
+                with self._commit_cond:
+                    self._queue = []
+                    covered = self._queued_seq
+                if self.snapshot_format == "binary":
+                    write_atomic(self.storage_path, BinarySnapshot.encode(reminders))
+                else:
+                    write_atomic(self.storage_path, snapshot_lines())
+                self._write_journal("", truncate=True)
+                self.journal_entries = 0
+                self.snapshot_size = len(reminders)
+                self._snapshot_stamp = file_stamp(self.storage_path)
+                self._journal_offset = 0
+                self._own_ranges = []
+                self._mark_durable(covered)
+            if metrics.enabled:
+                metrics.observe("storage_save_seconds", time.perf_counter() - begin)
+                metrics.observe("storage_save_bytes", self._snapshot_stamp[2], SIZE_BUCKETS)
+                metrics.inc("storage_saved_records_total", len(reminders))
             return True
         except Exception as e:
             print(f"Error saving reminders: {e}")
             return False
 
+    def _write_journal(self, text: str, truncate: bool = False) -> None:
+        # called with the exclusive lock held
+        with self.journal_path.open('wb' if truncate else 'ab') as f:
+            start = f.tell()
+            f.write(text.encode())
+            f.flush()
+            os.fsync(f.fileno())
+            # our own entries are already applied in memory: skip past them,
+            # or remember where they are if another process appended first
+            if start == self._journal_offset:
+                self._journal_offset = f.tell()
+            elif not truncate:
+                self._own_ranges.append((start, f.tell()))
+
+    def _mark_durable(self, seq: int) -> None:
+        with self._commit_cond:
+            self._durable_seq = max(self._durable_seq, seq)
+            self._commit_error = None
+            self._commit_cond.notify_all()
+
+    def _append_entry(self, entry: Dict[str, Any]) -> bool:
+        return self._append_entries([entry])
+
+    def _append_entries(self, entries: List[Dict[str, Any]]) -> bool:
+        text = "".join(json.dumps(entry) + "\n" for entry in entries)
+        if self.commit_window > 0:
+            with self._commit_cond:
+                self._queue.append(text)
+                self._queued_seq += 1
+                self.journal_entries += len(entries)
+                if self._flusher is None:
+                    self._closing = False
+                    self._flusher = threading.Thread(target=self._flush_loop, name="StorageFlusher", daemon=True)
+                    self._flusher.start()
+                self._commit_cond.notify_all()
+            return True
+        try:
+            # concurrent writers append whole lines, one at a time
+            with self.lock.hold(), self._io_lock:
+                self._write_journal(text)
+                self.journal_entries += len(entries)
+                self.commits += 1
+            return True
+        except Exception as e:
+            print(f"Error writing journal: {e}")
+            return False
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._commit_cond:
+                self._commit_cond.wait_for(lambda: self._queue or self._closing)
+                if self._closing and not self._queue:
+                    self._flusher = None
+                    return
+                closing = self._closing
+            if not closing:
+                # let the rest of the burst arrive before writing (or retrying)
+                time.sleep(self.commit_window)
+            if not self.flush() and closing:
+                # no more retries on the way out; close() reports what is left
+                with self._commit_cond:
+                    self._flusher = None
+                return
+
+    def flush(self) -> bool:
+        # writes out everything queued so far as one group commit; a batch
+        # that fails goes back to the front of the queue for the next try
+        with self.lock.hold(), self._io_lock:
+            with self._commit_cond:
+                batch, self._queue = self._queue, []
+                seq = self._queued_seq
+            if batch:
+                try:
+                    self._write_journal("".join(batch))
+                    self.commits += 1
+                except Exception as e:
+                    print(f"Error writing journal: {e}")
+                    with self._commit_cond:
+                        self._queue[:0] = batch
+                        self._commit_error = e
+                        self._commit_failures += 1
+                        self._commit_cond.notify_all()
+                    return False
+            self._mark_durable(seq)
+            return True
+
+    def sync(self, timeout: Optional[float] = None) -> bool:
+        # waits until every mutation recorded before the call is on disk;
+        # raises IOError if the next attempt to write it fails instead (or
+        # the last one did and the flusher has stopped retrying)
+        with self._commit_cond:
+            target = self._queued_seq
+            failures = self._commit_failures
+
+            def settled() -> bool:
+                if self._durable_seq >= target:
+                    return True
+                return self._commit_failures > failures or (self._flusher is None and self._commit_error is not None)
+
+            if not self._commit_cond.wait_for(settled, timeout):
+                return False
+            if self._durable_seq < target:
+                raise IOError(f"journal write failed: {self._commit_error}") from self._commit_error
+            return True
+
+    def close(self) -> None:
+        with self._commit_cond:
+            self._closing = True
+            flusher = self._flusher
+            self._commit_cond.notify_all()
+        if flusher is not None:
+            flusher.join()
+        self.flush()
+        self.lock.close()
+
+    def record_add(self, reminder: Reminder) -> bool:
+        return self._append_entry({"op": "add", "reminder": self._serialize_reminder(reminder)})
+
+    def record_many(self, reminders: List[Reminder]) -> bool:
+        # one journal write for a whole batch of new reminders
+        return self._append_entries([{"op": "add", "reminder": self._serialize_reminder(r)} for r in reminders])
+
+    def record_update(self, reminder: Reminder) -> bool:
+        return self._append_entry({"op": "update", "reminder": self._serialize_reminder(reminder)})
+
+    def record_complete(self, reminder: Reminder) -> bool:
+        return self._append_entry({"op": "complete", "id": reminder.id})
+
+    def record_remove(self, reminder: Reminder) -> bool:
+        return self._append_entry({"op": "remove", "id": reminder.id})
+
+    def needs_compaction(self) -> bool:
+        # growing the threshold with the snapshot keeps compaction amortized O(1) per write
+        return self.journal_entries >= max(self.compact_threshold, self.snapshot_size)
+
+    def _decode_entry(self, entry: Dict[str, Any]) -> Tuple[str, Union[Reminder, str]]:
+        # (op, reminder) for add/update, (op, id) for complete/remove
+        op = entry["op"]
+        if op in ("add", "update"):
+            return op, self._deserialize_reminder(entry["reminder"])
+        if op in ("complete", "remove"):
+            return op, entry["id"]
+        raise ValueError(f"unknown journal op {op!r}")
+
+    def _read_journal(self, offset: int = 0) -> List[Tuple[str, Union[Reminder, str]]]:
+        # decodes journal entries from a byte offset on and moves the offset to the end
+        changes = []
+        try:
+            f = self.journal_path.open('rb')
+        except FileNotFoundError:
+            self._journal_offset = 0
+            return changes
+        with f:
+            f.seek(offset)
+            position = offset
+            for number, line in enumerate(f, 1):
+                start, position = position, position + len(line)
+                if any(lo <= start < hi for lo, hi in self._own_ranges):
+                    continue
+                try:
+                    changes.append(self._decode_entry(json.loads(line)))
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    # usually a torn final line from an interrupted append
+                    self.skipped_records.append((f"journal line {number} after byte {offset}", str(e)))
+            self._journal_offset = position
+        self._own_ranges = []
+        return changes
+
+    def _replay_journal(self, reminders: Dict[str, Reminder]) -> None:
+        for op, value in self._read_journal():
+            if op in ("add", "update"):
+                reminders[value.id] = value
+            elif op == "complete" and value in reminders:
+                reminders[value].completed = True
+            elif op == "remove":
+                reminders.pop(value, None)
+            self.journal_entries += 1
+
+    def poll_changes(self) -> Optional[List[Tuple[str, Union[Reminder, str]]]]:
+        # What other processes wrote since we last loaded or polled: the new
+        # journal entries, or None when the snapshot was rewritten (another
+        # process compacted) and everything must be reloaded. Two stat calls
+        # when nothing changed.
+        stamp = file_stamp(self.journal_path)
+        size = stamp[2] if stamp else 0
+        if file_stamp(self.storage_path) == self._snapshot_stamp and size == self._journal_offset:
+            return []
+        with self.lock.hold(exclusive=False):
+            rewritten = file_stamp(self.storage_path) != self._snapshot_stamp or size < self._journal_offset
+            if not rewritten:
+                changes = self._read_journal(self._journal_offset)
+        if rewritten:
+            # queued writes must land before the caller reloads from disk
+            self.flush()
+            return None
+        self.journal_entries += len(changes)
+        return changes
+
+    def iter_reminders(self) -> Iterator[Reminder]:
+        # streams the snapshot, skipping (and recording) records that fail to parse
+        with self.storage_path.open('rb') as f:
+            if BinarySnapshot.is_binary(f.read(len(BinarySnapshot.MAGIC))):
+                # checksummed as a whole, so it loads entirely or not at all;
+                # decoded straight from the mapped file instead of a copy of it
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        reminders = BinarySnapshot.decode(mapped)
+                except ValueError as e:
+                    raise SnapshotError(self.storage_path, e) from e
+                yield from reminders
+                return
+        with self.storage_path.open('r') as f:
+            for index, data in iter_json_array(f):
+                try:
+                    if isinstance(data, Exception):
+                        raise data
+                    yield self._deserialize_reminder(data, index)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    self.skipped_records.append((f"snapshot record {index}", str(e)))
+
     def load_reminders(self) -> List[Reminder]:
+        self.skipped_records = []
+        begin = time.perf_counter()
         try:
-            with self.storage_path.open('r') as f:
-                reminder_data = json.load(f)
-            return [self._deserialize_reminder(data) for data in reminder_data]
+            reminders = {}
+            with self.lock.hold(exclusive=False), gc_paused():
+                self._snapshot_stamp = file_stamp(self.storage_path)
+                # a full read rebuilds from disk, our own entries included
+                self._own_ranges = []
+                for reminder in self.iter_reminders():
+                    reminders[reminder.id] = reminder
+                self.journal_entries = 0
+                self.snapshot_size = len(reminders)
+                self._replay_journal(reminders)
+            if self.skipped_records:
+                print(f"Skipped {len(self.skipped_records)} unreadable reminder records")
+            if metrics.enabled:
+                metrics.observe("storage_load_seconds", time.perf_counter() - begin)
+                metrics.observe("storage_load_bytes", self._snapshot_stamp[2] + self._journal_offset, SIZE_BUCKETS)
+                metrics.inc("storage_loaded_records_total", len(reminders))
+                metrics.inc("storage_skipped_records_total", len(self.skipped_records))
+            return list(reminders.values())
+        except SnapshotError:
+            raise
         except Exception as e:
             print(f"Error loading reminders: {e}")
             return []
 
     def clear_storage(self) -> bool:
-        try:
-            self.storage_path.write_text("[]")
-            return True
-        except Exception as e:
-            print(f"Error clearing storage: {e}")
-            return False
\ No newline at end of file
+        return self.save_reminders([])
+def legacy_store(data_dir: Optional[Path] = None) -> Optional[Path]:
+    # the shared reminders.json from before per-user shards, if it still holds
+    # anything; no user's shard reads it
+    path = (Path(data_dir) if data_dir else DEFAULT_DATA_DIR) / "reminders.json"
+    snapshot, journal = file_stamp(path), file_stamp(path.with_suffix(".journal"))
+    if (snapshot and snapshot[2] > len("[\n]\n")) or (journal and journal[2]):
+        return path
+    return None
+
+def warn_legacy_store(data_dir: Optional[Path] = None) -> None:
+    path = legacy_store(data_dir)
+    if path is not None:
+        print(f"Note: {path} holds reminders from before per-user storage that no account loads; "
+              f"run `python StorageService.py <username>` to move them to that user")
+
+def adopt_legacy_reminders(username: str, data_dir: Optional[Path] = None) -> int:
+    # moves the shared store, journal included, into username's shard; it
+    # belongs to no one, so only its owner can ask for this. The old files
+    # are kept as *.adopted
+    if legacy_store(data_dir) is None:
+        return 0
+    legacy = StorageService(data_dir=data_dir)
+    reminders = legacy.load_reminders()
+    legacy.close()
+    shard = StorageService(username=username, data_dir=data_dir)
+    known = {reminder.id for reminder in shard.load_reminders()}
+    adopted = [reminder for reminder in reminders if reminder.id not in known]
+    recorded = not adopted or shard.record_many(adopted)
+    shard.close()
+    if not recorded:
+        return 0
+    for path in (legacy.storage_path, legacy.journal_path):
+        if path.exists():
+            path.replace(path.with_name(path.name + ".adopted"))
+    return len(adopted)
+
+if __name__ == "__main__":
+    # usage: python StorageService.py <username>
+    import sys
+    if len(sys.argv) != 2:
+        print("Usage: python StorageService.py <username>")
+        sys.exit(1)
+    print(f"Moved {adopt_legacy_reminders(sys.argv[1])} reminders from the shared reminders.json to {sys.argv[1]}")
@@ -1,9 +1,36 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 import re
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
+from Metrics import metrics
+
+# Every accepted input shape in one pattern. Each alternative is wrapped in
+# its own named group, so match.lastgroup says which format matched and no
+# format is tried and thrown away. The relative words are filled in from
+# each parser's relative_time_map.
+_INPUT_TEMPLATE = r"""
+      (?P<relative>(?P<offset>%s)\s+at\s+(?P<time>.+)$)
+    | (?P<shortcut>(?P<sy>\d{4})-(?P<sm>\d{2})-(?P<sd>\d{2})\s+(?P<word>[a-z_]\w*))
+    | (?P<ymd>(?P<y>\d{4})(?P<ymd_sep>[-/])(?P<m>\d{1,2})(?P=ymd_sep)(?P<d>\d{1,2})
+      \s+(?P<ymd_hour>\d{1,2}):(?P<ymd_minute>\d{1,2})$)
+    | (?P<xxy>(?P<first>\d{1,2})(?P<sep>[-/])(?P<second>\d{1,2})(?P=sep)(?P<year>\d{4})
+      \s+(?P<hour>\d{1,2}):(?P<minute>\d{1,2})$)
+"""
+
+@lru_cache(maxsize=None)
+def _input_pattern(offsets: Tuple[str, ...]) -> "re.Pattern":
+    # longest first, so "next week" is not cut short by a shorter word
+    alternatives = "|".join(re.escape(word) for word in sorted(offsets, key=len, reverse=True))
+    return re.compile(_INPUT_TEMPLATE % (alternatives or "(?!)"), re.VERBOSE)
+
+# "9:30", "21.30", "9:30pm", "9:30 am"
+_TIME_PATTERN = re.compile(r"(?P<hour>\d{1,2})[:.](?P<minute>\d{1,2})(?:\s*(?P<period>am|pm))?$")
+
+# A parsed input is either a fixed datetime or a day offset from today plus a time
+Shape = Tuple
 
 class TimeParser:
-    def __init__(self):
+    def __init__(self, cache_size: int = 4096):
         self.standard_format = "%Y-%m-%d %H:%M"
         
         # Map of common relative time words
@@ -24,86 +51,120 @@ class TimeParser:
             'midnight': '00:00',
         }
 
+        # Repeated inputs skip the regex entirely. Relative inputs are cached
+        # by shape (offset, hour, minute) so "today" is still resolved per call.
+        self._shape = lru_cache(maxsize=cache_size)(self._parse_shape)
+        self._pattern = _input_pattern(tuple(self.relative_time_map))
+
     def parse(self, time_str: str) -> Optional[datetime]:
+        if metrics.enabled:
+            return self._parse_measured(time_str)
         try:
-            time_str = time_str.lower().strip()
-            
-            # Try exact standard format first
+            return self._resolve(self._shape(time_str.lower().strip()), datetime.now)
+        except Exception as e:
+            print(f"Error parsing time: {e}")
+            return None
+
+    def _parse_measured(self, time_str: str) -> Optional[datetime]:
+        # parse() with latency, cache and outcome metrics; the branch that
+        # matched is counted in _parse_shape on cache misses
+        misses = self._shape.cache_info().misses
+        with metrics.timer("time_parser_parse_seconds"):
+            try:
+                result = self._resolve(self._shape(time_str.lower().strip()), datetime.now)
+            except Exception as e:
+                print(f"Error parsing time: {e}")
+                result = None
+        metrics.inc("time_parser_cache_total", result="miss" if self._shape.cache_info().misses > misses else "hit")
+        metrics.inc("time_parser_parse_total", result="ok" if result else "invalid")
+        return result
+
+    def parse_many(self, time_strs: Iterable[str]) -> List[Optional[datetime]]:
+        # bulk variant for imports: "now" is read once for the whole batch
+        now = datetime.now()
+        results = []
+        for time_str in time_strs:
+            try:
+                results.append(self._resolve(self._shape(time_str.lower().strip()), lambda: now))
+            except Exception:
+                results.append(None)
+        return results
+
+    def clear_cache(self) -> None:
+        # needed after changing relative_time_map or time_shortcuts
+        self._pattern = _input_pattern(tuple(self.relative_time_map))
+        self._shape.cache_clear()
+
+    def _resolve(self, shape: Optional[Shape], now) -> Optional[datetime]:
+        if shape is None:
+            return None
+        if len(shape) == 1:
+            return shape[0]
+        days, hour, minute = shape
+        return (now() + timedelta(days=days)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    def _parse_shape(self, time_str: str) -> Optional[Shape]:
+        # the standard format is by far the most common; fromisoformat reads it in C
+        if len(time_str) == 16 and time_str[4] == '-' and time_str[7] == '-' and time_str[10] == ' ' and time_str[13] == ':':
             try:
-                return datetime.strptime(time_str, self.standard_format)
+                shape = (datetime.fromisoformat(time_str),)
+                if metrics.enabled:
+                    metrics.inc("time_parser_branch_total", branch="iso")
+                return shape
             except ValueError:
                 pass
 
-            # Handle relative dates
-            for word, days in self.relative_time_map.items():
-                pattern = f"^{word}\\s+at\\s+(.+)$"
-                match = re.match(pattern, time_str)
-                if match:
-                    time_part = match.group(1)
-                    base_date = datetime.now() + timedelta(days=days)
-                    time_value = self._parse_time_part(time_part)
-                    if time_value:
-                        return base_date.replace(
-                            hour=time_value.hour,
-                            minute=time_value.minute,
-                            second=0,
-                            microsecond=0
-                        )
-
-            # Handle date with time shortcuts
-            date_with_shortcut = re.match(r"(\d{4}-\d{2}-\d{2})\s+(\w+)", time_str)
-            if date_with_shortcut:
-                date_str = date_with_shortcut.group(1)
-                time_word = date_with_shortcut.group(2)
-                if time_word in self.time_shortcuts:
-                    return datetime.strptime(f"{date_str} {self.time_shortcuts[time_word]}", "%Y-%m-%d %H:%M")
-
-            # Handle common date formats
-            formats_to_try = [
-                "%Y-%m-%d %H:%M",
-                "%m/%d/%Y %H:%M",
-                "%d/%m/%Y %H:%M",
-                "%Y/%m/%d %H:%M",
-                "%m-%d-%Y %H:%M",
-                "%d-%m-%Y %H:%M",
-            ]
-
-            for fmt in formats_to_try:
-                try:
-                    return datetime.strptime(time_str, fmt)
-                except ValueError:
-                    continue
-
+        match = self._pattern.match(time_str)
+        kind = match.lastgroup if match else None
+        if metrics.enabled:
+            metrics.inc("time_parser_branch_total", branch=kind or "unmatched")
+        if not match:
             return None
 
-        except Exception as e:
-            print(f"Error parsing time: {e}")
+        if kind == 'relative':
+            time_value = self._parse_time_part(match['time'])
+            if time_value is None:
+                return None
+            return (self.relative_time_map[match['offset']],) + time_value
+
+        if kind == 'shortcut':
+            shortcut = self.time_shortcuts.get(match['word'])
+            if shortcut is None:
+                return None
+            hour, minute = shortcut.split(':')
+            return (datetime(int(match['sy']), int(match['sm']), int(match['sd']), int(hour), int(minute)),)
+
+        if kind == 'ymd':
+            return self._build(match['y'], match['m'], match['d'], match['ymd_hour'], match['ymd_minute'])
+
+        # MM/DD/YYYY is tried before DD/MM/YYYY, same for dashes
+        return (self._build(match['year'], match['first'], match['second'], match['hour'], match['minute'])
+                or self._build(match['year'], match['second'], match['first'], match['hour'], match['minute']))
+
+    def _build(self, year: str, month: str, day: str, hour: str, minute: str) -> Optional[Shape]:
+        try:
+            return (datetime(int(year), int(month), int(day), int(hour), int(minute)),)
+        except ValueError:
             return None
 
-    def _parse_time_part(self, time_str: str) -> Optional[datetime]:
+    def _parse_time_part(self, time_str: str) -> Optional[Tuple[int, int]]:
         # Check for time shortcuts first
         if time_str in self.time_shortcuts:
-            base_date = datetime.now()
-            return datetime.strptime(f"{base_date.date()} {self.time_shortcuts[time_str]}", 
-                                   "%Y-%m-%d %H:%M")
-
-        time_formats = [
-            "%H:%M",
-            "%I:%M%p",
-            "%I:%M %p",
-            "%H.%M",
-        ]
-
-        for fmt in time_formats:
-            try:
-                # Add a dummy date to create a full datetime
-                dummy_date = datetime.now().date()
-                time_str = time_str.replace(".", ":")
-                return datetime.strptime(f"{dummy_date} {time_str}", f"%Y-%m-%d {fmt}")
-            except ValueError:
-                continue
+            hour, minute = self.time_shortcuts[time_str].split(':')
+            return int(hour), int(minute)
 
-        return None
+        match = _TIME_PATTERN.match(time_str)
+        if not match:
+            return None
+        hour, minute = int(match.group('hour')), int(match.group('minute'))
+        period = match.group('period')
+        if period:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if period == 'pm' else 0)
+        if hour > 23 or minute > 59:
+            return None
+        return hour, minute
 
     def format_datetime(self, dt: datetime) -> str:
-        return dt.strftime(self.standard_format)
\ No newline at end of file
+        return dt.strftime(self.standard_format)
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 import json
+import threading
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Callable, Iterable, List, Optional, Dict, Tuple
+from StorageService import DEFAULT_DATA_DIR, FileLock, file_stamp, write_atomic
 
 @dataclass
 class User:
@@ -12,15 +14,29 @@ class User:
     
 
 class UserService:
-    def __init__(self, storage_file: str = "users.json"):
-        # Get the directory where the script is located
-        base_dir = Path(__file__).parent.parent
+    def __init__(self, storage_file: str = "users.json", on_login: Optional[Callable[[User], None]] = None,
+                 data_dir: Optional[Path] = None, compact_threshold: int = 1000):
         # Use the same data directory as reminders
-        data_dir = base_dir / 'data'
-        data_dir.mkdir(exist_ok=True)
+        data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+        data_dir.mkdir(parents=True, exist_ok=True)
         # Set the full path for the storage file
         self.storage_path = data_dir / storage_file
+        # new accounts are appended here and folded into users.json on compaction
+        self.journal_path = self.storage_path.with_suffix(".journal")
+        self.compact_threshold = compact_threshold
         self.current_user: Optional[User] = None
+        # lets the caller load per-user state (e.g. the reminder shard) on login
+        self.on_login = on_login
+        # username -> User, loaded once; afterwards only journal lines other
+        # processes appended are read, unless users.json itself was rewritten
+        self._users: Optional[Dict[str, User]] = None
+        self._snapshot_stamp: Optional[Tuple] = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        # the index and journal are shared by every thread of a server process,
+        # and the files by every process using the data directory
+        self._lock = threading.RLock()
+        self.file_lock = FileLock(self.storage_path.with_suffix(".lock"))
         self._ensure_storage_exists()
 
     def _ensure_storage_exists(self) -> None:
@@ -35,35 +51,88 @@ class UserService:
     def _deserialize_user(self, data: Dict) -> User:
         return User(username=data["username"])
 
-    def create_user(self, username: str) -> Optional[User]:
-        try:
-            with self.storage_path.open('r') as f:
-                users = json.load(f)
-            
-            if username in users:
-                print(f"User {username} already exists.")
-                return None
+    def _index(self) -> Dict[str, User]:
+        with self._lock:
+            return self._load_index()
 
-            new_user = User(username=username)
-            users[username] = self._serialize_user(new_user)
+    def _load_index(self) -> Dict[str, User]:
+        journal = file_stamp(self.journal_path)
+        journal_size = journal[2] if journal else 0
+        if (self._users is not None and file_stamp(self.storage_path) == self._snapshot_stamp
+                and journal_size == self._journal_offset):
+            return self._users
+        with self.file_lock.hold(exclusive=False):
+            snapshot = file_stamp(self.storage_path)
+            if self._users is None or snapshot != self._snapshot_stamp or journal_size < self._journal_offset:
+                with self.storage_path.open('r') as f:
+                    self._users = {name: self._deserialize_user(data) for name, data in json.load(f).items()}
+                self._snapshot_stamp = snapshot
+                self._journal_offset = 0
+                self._journal_entries = 0
+            self._read_journal()
+        return self._users
 
-            with self.storage_path.open('w') as f:
-                json.dump(users, f, indent=2)
+    def _read_journal(self) -> None:
+        # applies journal lines past the last offset we read
+        try:
+            f = self.journal_path.open('rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self._journal_offset)
+            for line in f:
+                try:
+                    user = self._deserialize_user(json.loads(line))
+                except (ValueError, KeyError):
+                    # a torn final line from an interrupted append
+                    continue
+                self._users[user.username] = user
+                self._journal_entries += 1
+            self._journal_offset = f.tell()
 
-            return new_user
+    def create_users(self, usernames: Iterable[str]) -> List[User]:
+        # batched signup: one journal append for every new account in the batch
+        try:
+            with self._lock, self.file_lock.hold():
+                users = self._load_index()
+                created = []
+                for username in usernames:
+                    if username in users:
+                        print(f"User {username} already exists.")
+                        continue
+                    user = User(username=username)
+                    users[username] = user
+                    created.append(user)
+                if created:
+                    with self.journal_path.open('ab') as f:
+                        f.write("".join(json.dumps(self._serialize_user(u)) + "\n" for u in created).encode())
+                        # we hold the writer lock and were caught up, so the new end is ours
+                        self._journal_offset = f.tell()
+                    self._journal_entries += len(created)
+                    if self._journal_entries >= max(self.compact_threshold, len(users) // 2):
+                        self._compact()
+                return created
         except Exception as e:
             print(f"Error creating user: {e}")
-            return None
+            self._users = None
+            return []
+
+    def _compact(self) -> None:
+        # snapshot first (atomically), then drop the journal it now covers
+        users = {name: self._serialize_user(user) for name, user in self._users.items()}
+        write_atomic(self.storage_path, json.dumps(users, indent=2))
+        self.journal_path.write_text("")
+        self._snapshot_stamp = file_stamp(self.storage_path)
+        self._journal_offset = 0
+        self._journal_entries = 0
+
+    def create_user(self, username: str) -> Optional[User]:
+        created = self.create_users([username])
+        return created[0] if created else None
 
     def get_user(self, username: str) -> Optional[User]:
         try:
-            with self.storage_path.open('r') as f:
-                users = json.load(f)
-            
-            if username not in users:
-                return None
-
-            return self._deserialize_user(users[username])
+            return self._index().get(username)
         except Exception as e:
             print(f"Error retrieving user: {e}")
             return None
@@ -72,6 +141,8 @@ class UserService:
         user = self.get_user(username)
         if user:
             self.current_user = user
+            if self.on_login:
+                self.on_login(user)
             return True
         return False
 
@@ -79,4 +150,4 @@ class UserService:
         self.current_user = None
 
     def get_current_user(self) -> Optional[User]:
-        return self.current_user
\ No newline at end of file
+        return self.current_user
@@ -0,0 +1,2 @@
+# Run benchmarks from the Final-Project directory, e.g.
+#   python -m benchmarks.recurrence_batch
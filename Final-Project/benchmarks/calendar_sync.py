@@ -0,0 +1,152 @@
+# Calendar sync against a local CalDAV stand-in: a full re-download of every
+# calendar against incremental sync-token deltas after a 1% change, plus
+# conditional polling of a plain ICS feed
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from xml.sax.saxutils import escape
+from ImportExportService import reminder_to_ics
+from IntegrationManager import CalendarAccount, IntegrationManager
+from Reminder import Reminder
+from ReminderManager import ReminderShards
+from StorageService import StorageService
+
+class Calendar:
+    # events by href plus a change log; the sync token is the log position
+    def __init__(self):
+        self.events = {}
+        self.log = []
+        self.lock = threading.Lock()
+
+    def put(self, href: str, reminder: Reminder) -> None:
+        with self.lock:
+            self.log.append(href)
+            self.events[href] = (f'"{len(self.log)}"', reminder_to_ics(reminder, uid=href.rsplit("/", 1)[-1]))
+
+    def delete(self, href: str) -> None:
+        with self.lock:
+            self.log.append(href)
+            self.events.pop(href, None)
+
+class CalDAVStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    calendars = {}
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _reply(self, status: int, body: str = "", headers=None) -> None:
+        data = body.encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _response(self, href: str, props: str = "", status: str = "200 OK") -> str:
+        if not props:
+            return f"<d:response><d:href>{escape(href)}</d:href><d:status>HTTP/1.1 {status}</d:status></d:response>"
+        return (f"<d:response><d:href>{escape(href)}</d:href><d:propstat><d:prop>{props}</d:prop>"
+                f"<d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>")
+
+    def do_GET(self) -> None:
+        calendar = self.calendars[self.path.rstrip("/").removesuffix(".ics")]
+        with calendar.lock:
+            etag = f'"v{len(calendar.log)}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._reply(304, headers={"ETag": etag})
+                return
+            body = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + "".join(ics for _, ics in calendar.events.values()) + "END:VCALENDAR\r\n"
+        self._reply(200, body, {"ETag": etag, "Content-Type": "text/calendar"})
+
+    def do_REPORT(self) -> None:
+        calendar = self.calendars[self.path.rstrip("/")]
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode()
+        parts = []
+        with calendar.lock:
+            if "sync-collection" in body:
+                token = re.search(r"<d:sync-token>(.*?)</d:sync-token>", body).group(1)
+                if token:
+                    if not token.isdigit() or int(token) > len(calendar.log):
+                        self._reply(409)
+                        return
+                    hrefs = dict.fromkeys(calendar.log[int(token):])
+                else:
+                    hrefs = dict.fromkeys(calendar.events)
+                for href in hrefs:
+                    if href in calendar.events:
+                        parts.append(self._response(href, f"<d:getetag>{calendar.events[href][0]}</d:getetag>"))
+                    else:
+                        parts.append(self._response(href, status="404 Not Found"))
+                parts.append(f"<d:sync-token>{len(calendar.log)}</d:sync-token>")
+            else:
+                for href in re.findall(r"<d:href>(.*?)</d:href>", body):
+                    if href in calendar.events:
+                        etag, ics = calendar.events[href]
+                        calendar_data = escape("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + ics + "END:VCALENDAR\r\n")
+                        parts.append(self._response(href, f"<d:getetag>{etag}</d:getetag>"
+                                                          f"<c:calendar-data>{calendar_data}</c:calendar-data>"))
+        xml = ('<?xml version="1.0" encoding="utf-8"?>'
+               '<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">' + "".join(parts) + "</d:multistatus>")
+        self._reply(207, xml, {"Content-Type": "application/xml; charset=utf-8"})
+
+def main(events: int = 5000, accounts: int = 4) -> None:
+    start = datetime(2026, 1, 1, 9, 0)
+    for a in range(accounts):
+        calendar = Calendar()
+        for i in range(events // accounts):
+            calendar.put(f"/cal/{a}/event-{i}.ics", Reminder(title=f"event {a}-{i}", datetime=start + timedelta(hours=i)))
+        CalDAVStandIn.calendars[f"/cal/{a}"] = calendar
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CalDAVStandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        shards = ReminderShards(storage_factory=lambda u: StorageService(username=u, data_dir=data_dir))
+        integrations = IntegrationManager(shards, data_dir=data_dir)
+        for a in range(accounts):
+            integrations.add_account(CalendarAccount(name=f"caldav-{a}", url=f"{base}/cal/{a}", owner=f"user{a}"))
+        integrations.add_account(CalendarAccount(name="feed", url=f"{base}/cal/0.ics", owner="feed", kind="ics"))
+        caldav = [f"caldav-{a}" for a in range(accounts)]
+        print(f"{events} events in {accounts} CalDAV calendars")
+
+        def timed(label: str, names) -> None:
+            begin = time.perf_counter()
+            results = integrations.sync_all(names)
+            elapsed = time.perf_counter() - begin
+            changes = sum(r.added + r.updated + r.removed for r in results)
+            fetched = sum(r.fetched_bytes for r in results)
+            print(f"{label:>28}: {elapsed * 1000:8.1f} ms, {changes:>5} changes, {fetched:>10,} bytes")
+
+        timed("initial sync", caldav)
+        # change 1% of each calendar
+        for a in range(accounts):
+            calendar = CalDAVStandIn.calendars[f"/cal/{a}"]
+            for i in range(0, events // accounts, 100):
+                calendar.put(f"/cal/{a}/event-{i}.ics", Reminder(title=f"moved {a}-{i}", datetime=start + timedelta(hours=i, minutes=30)))
+            calendar.delete(f"/cal/{a}/event-1.ics")
+        timed("incremental after 1% change", caldav)
+        timed("incremental, no changes", caldav)
+        for path in (data_dir / "integrations").glob("caldav-*"):
+            path.unlink()
+        timed("full re-download", caldav)
+        timed("ICS feed first poll", ["feed"])
+        timed("ICS feed unchanged (304)", ["feed"])
+        print(f"connections opened: {integrations.pool.opened}")
+        integrations.close()
+        shards.close()
+    finally:
+        server.shutdown()
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,86 @@
+# Reproducible synthetic data for the benchmarks: users, reminders with a
+# realistic mix of recurrence types, intervals and completion, and a corpus
+# of the date strings people actually type
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+from Reminder import Reminder
+from StorageService import StorageService
+
+EPOCH = datetime(2026, 1, 1)
+
+WORDS = ["call", "email", "pay", "review", "book", "buy", "renew", "submit", "check", "plan",
+         "dentist", "rent", "taxes", "report", "groceries", "gym", "mom", "invoice", "flight", "standup"]
+
+# weights for None (one-off) and each recurrence type
+RECURRENCE_MIX = [(None, 80), (RecurrenceType.DAILY, 6), (RecurrenceType.WEEKLY, 8),
+                  (RecurrenceType.MONTHLY, 5), (RecurrenceType.YEARLY, 1)]
+
+def usernames(count: int) -> List[str]:
+    return [f"user{i:07d}" for i in range(count)]
+
+def iter_reminders(count: int, seed: int = 345, completed_ratio: float = 0.3,
+                   described_ratio: float = 0.4) -> Iterator[Reminder]:
+    rng = random.Random(seed)
+    kinds, weights = zip(*RECURRENCE_MIX)
+    for i in range(count):
+        title = " ".join(rng.choices(WORDS, k=rng.randint(1, 4)))
+        # due times spread over two years, on 5-minute boundaries
+        when = EPOCH + timedelta(minutes=5 * rng.randrange(-105_120, 105_120))
+        kind = rng.choices(kinds, weights)[0]
+        rule = RecurrenceRule(type=kind, interval=rng.choice((1, 1, 1, 2, 3, 4)), anchor=when) if kind else None
+        yield Reminder(
+            title=title,
+            datetime=when,
+            description=f"{title} #{i}" if rng.random() < described_ratio else None,
+            is_recurring=rule is not None,
+            recurrence_rule=rule,
+            completed=rng.random() < completed_ratio,
+            id=f"{rng.getrandbits(128):032x}",
+        )
+
+def reminders(count: int, seed: int = 345, **kwargs) -> List[Reminder]:
+    return list(iter_reminders(count, seed, **kwargs))
+
+def time_inputs(count: int, seed: int = 345) -> List[str]:
+    # mostly the standard format, then relative phrases, shortcuts,
+    # US/EU dates and a few typos, in roughly the proportions users type them
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        day = EPOCH + timedelta(days=rng.randrange(730))
+        hour, minute = rng.randrange(24), rng.choice((0, 0, 15, 30, 45))
+        roll = rng.random()
+        if roll < 0.55:
+            result.append(f"{day:%Y-%m-%d} {hour:02d}:{minute:02d}")
+        elif roll < 0.70:
+            offset = rng.choice(("today", "tomorrow", "next week", "next month"))
+            hour12 = hour % 12 or 12
+            result.append(rng.choice((f"{offset} at {hour}:{minute:02d}",
+                                      f"{offset} at {hour12}:{minute:02d}{'pm' if hour >= 12 else 'am'}",
+                                      f"{offset} at morning")))
+        elif roll < 0.80:
+            result.append(f"{day:%Y-%m-%d} {rng.choice(('morning', 'noon', 'afternoon', 'evening', 'night'))}")
+        elif roll < 0.95:
+            result.append(rng.choice((f"{day:%m/%d/%Y} {hour}:{minute:02d}", f"{day:%d-%m-%Y} {hour}:{minute:02d}",
+                                      f"{day:%Y/%m/%d} {hour}:{minute:02d}")))
+        else:
+            result.append(rng.choice(("tomorow at 9", "2026-13-01 10:00", "next tuesday", "")))
+    return result
+
+def write_store(count: int, data_dir: Path, username: str = "bench", seed: int = 345) -> StorageService:
+    # a ready-made snapshot for one user
+    storage = StorageService(username=username, data_dir=data_dir)
+    storage.save_reminders(reminders(count, seed))
+    return storage
+
+if __name__ == "__main__":
+    # python -m benchmarks.dataset <count> <data dir> [username]
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python -m benchmarks.dataset <count> <data dir> [username]")
+        sys.exit(1)
+    store = write_store(int(sys.argv[1]), Path(sys.argv[2]), *(sys.argv[3:]))
+    print(f"Wrote {sys.argv[1]} reminders to {store.storage_path}")
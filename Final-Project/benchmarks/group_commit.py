@@ -0,0 +1,41 @@
+# Journal write throughput under bursty mutations: one fsync per mutation
+# against group commit with a commit window
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from Reminder import Reminder
+from StorageService import StorageService
+
+def burst(storage: StorageService, writers: int, per_writer: int) -> float:
+    def write():
+        for i in range(per_writer):
+            storage.record_add(Reminder(title=f"burst {i}", datetime=datetime(2026, 1, 1)))
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    storage.sync()
+    return time.perf_counter() - begin
+
+def main(mutations: int = 2000, writers: int = 4) -> None:
+    print(f"mutations: {mutations} from {writers} threads")
+    for window in (0.0, 0.005, 0.05):
+        data_dir = Path(tempfile.mkdtemp())
+        try:
+            storage = StorageService(data_dir=data_dir, commit_window=window, compact_threshold=10 ** 9)
+            elapsed = burst(storage, writers, mutations // writers)
+            storage.close()
+            label = "sync per mutation" if window == 0 else f"window {window * 1000:.0f} ms"
+            print(f"{label:>18}: {mutations / elapsed:>9,.0f} mutations/s, {storage.commits} fsyncs "
+                  f"({mutations / storage.commits:.0f} mutations/commit)")
+        finally:
+            shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
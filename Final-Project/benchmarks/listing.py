@@ -0,0 +1,41 @@
+# Showing a page of a large account: formatting the whole list up front
+# (the old menus) vs keyset pages rendered on demand, cold and cached
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.dataset import reminders
+from ReminderManager import ReminderManager
+from StorageService import StorageService
+
+PAGE = 20
+
+def timed(action, repeat: int = 20) -> float:
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return (time.perf_counter() - begin) / repeat
+
+def main(sizes) -> None:
+    for count in sizes:
+        data_dir = Path(tempfile.mkdtemp())
+        try:
+            StorageService(username="bench", data_dir=data_dir, snapshot_format="binary").save_reminders(reminders(count))
+            manager = ReminderManager(storage=StorageService(username="bench", data_dir=data_dir))
+            everything = timed(lambda: [f"{i}. {r}" for i, r in enumerate(manager.get_all_reminders(), 1)], 3)
+            middle = manager.page(limit=count // 2).next_cursor
+
+            def cold_page():
+                manager._rendered.clear()
+                manager.render(manager.page(after=middle, limit=PAGE).reminders)
+
+            cold = timed(cold_page, 200)
+            cached = timed(lambda: manager.render(manager.page(after=middle, limit=PAGE).reminders), 200)
+            print(f"n={count:<8} format everything {everything * 1000:8.1f} ms | "
+                  f"page of {PAGE}: {cold * 1e6:6.1f} us, cached {cached * 1e6:6.1f} us")
+        finally:
+            shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,53 @@
+# Cost of the instrumentation on the hot paths, with metrics off and on,
+# followed by a sample of the Prometheus dump
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from Metrics import metrics
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+from Reminder import Reminder
+from ReminderManager import ReminderManager
+from StorageService import StorageService
+from TimeParser import TimeParser
+
+def per_call(action, count: int) -> float:
+    begin = time.perf_counter()
+    for i in range(count):
+        action(i)
+    return (time.perf_counter() - begin) / count
+
+def main(count: int = 100_000) -> None:
+    parser = TimeParser()
+    inputs = ["2026-03-01 09:30", "tomorrow at 9:30pm", "03/15/2026 14:00", "2026-03-01 morning"]
+    rule = RecurrenceRule(type=RecurrenceType.MONTHLY, interval=1, anchor=datetime(2026, 1, 31))
+    start = datetime(2026, 1, 31)
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        manager = ReminderManager(storage=StorageService(data_dir=data_dir, compact_threshold=10 ** 9))
+        manager.add_many([Reminder(title=f"r{i}", datetime=start + timedelta(minutes=i)) for i in range(10_000)])
+        cases = [
+            ("TimeParser.parse", lambda i: parser.parse(inputs[i & 3])),
+            ("get_next_occurrence", lambda i: rule.get_next_occurrence(start + timedelta(days=i % 1000))),
+            ("ReminderManager.next_due", lambda i: manager.next_due()),
+        ]
+        for name, action in cases:
+            metrics.disable()
+            off = per_call(action, count)
+            metrics.enable()
+            on = per_call(action, count)
+            print(f"{name:>26}: off {off * 1e6:6.2f} us, on {on * 1e6:6.2f} us")
+        metrics.enable()
+        manager.storage.save_reminders(manager.get_all_reminders())
+        StorageService(data_dir=data_dir).load_reminders()
+        metrics.disable()
+        print()
+        print("\n".join(line for line in metrics.to_prometheus().splitlines()
+                        if "_bucket" not in line and not line.startswith("# ")))
+    finally:
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,68 @@
+# Delivery of a burst of reminders all due at the same minute (e.g. 09:00):
+# one-at-a-time delivery against the batched NotificationService pipeline,
+# with a file sink and a slow local webhook stand-in
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from NotificationService import FileSink, Notification, NotificationService, WebhookSink
+from Reminder import Reminder
+
+class SlowWebhook(BaseHTTPRequestHandler):
+    # stands in for a remote endpoint with a fixed round-trip cost
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.01
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(self.latency)
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+def make_sinks(port: int, data_dir: Path, batch_size: int, concurrency: int):
+    return [FileSink(data_dir / "notifications.ndjson", batch_size=batch_size),
+            WebhookSink(f"http://127.0.0.1:{port}/hook", batch_size=batch_size, concurrency=concurrency)]
+
+def main(count: int = 2000) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowWebhook)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    due = datetime.now().replace(second=0, microsecond=0)
+    reminders = [Reminder(title=f"standup {i}", datetime=due) for i in range(count)]
+    print(f"{count} reminders due at {due:%H:%M}, webhook round trip {SlowWebhook.latency * 1000:.0f} ms")
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        # baseline: every notification sent on its own, in order
+        sinks = make_sinks(server.server_port, data_dir, 1, 1)
+        sample = reminders[:max(1, count // 10)]
+        begin = time.perf_counter()
+        for reminder in sample:
+            for sink in sinks:
+                sink.send([Notification(reminder)])
+        per_item = (time.perf_counter() - begin) / len(sample)
+        print(f"{'serial':>10}: {1 / per_item:>9,.0f} notifications/s (estimated {per_item * count:.1f} s for the burst)")
+
+        service = NotificationService(make_sinks(server.server_port, data_dir, 200, 4), workers=8)
+        begin = time.perf_counter()
+        service.notify(reminders + reminders[:count // 10])  # duplicates are dropped
+        service.drain()
+        elapsed = time.perf_counter() - begin
+        metrics = service.get_metrics()
+        service.stop()
+        print(f"{'pipeline':>10}: {count / elapsed:>9,.0f} notifications/s ({elapsed:.2f} s), "
+              f"{metrics['deduplicated']} duplicates dropped, p99 lag {metrics['p99_lag']:.2f} s")
+    finally:
+        server.shutdown()
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
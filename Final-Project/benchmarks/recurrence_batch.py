@@ -0,0 +1,42 @@
+# Scalar RecurrenceRule.get_next_occurrence vs the vectorized RecurrenceBatch
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+from RecurrenceBatch import RecurrenceBatch
+
+def make_rules(count: int, seed: int = 345):
+    rng = random.Random(seed)
+    types = list(RecurrenceType)
+    start = datetime(2015, 1, 1)
+    rules = []
+    for _ in range(count):
+        anchor = start + timedelta(days=rng.randint(0, 3650), minutes=rng.randint(0, 1439))
+        rules.append(RecurrenceRule(rng.choice(types), rng.randint(1, 6), anchor=anchor))
+    return rules
+
+def main(count: int = 1_000_000) -> None:
+    rules = make_rules(count)
+    after = datetime(2026, 1, 31, 12, 0)
+
+    begin = time.perf_counter()
+    scalar = [rule.get_next_occurrence(after) for rule in rules]
+    scalar_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    batch = RecurrenceBatch.from_rules(rules, [rule.anchor for rule in rules])
+    build_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    vector = batch.next_occurrences(after)
+    vector_time = time.perf_counter() - begin
+
+    assert vector.astype("datetime64[us]").tolist() == scalar
+    print(f"rules:            {count}")
+    print(f"scalar:           {scalar_time:.3f}s")
+    print(f"batch build:      {build_time:.3f}s")
+    print(f"batch compute:    {vector_time:.3f}s ({scalar_time / vector_time:.1f}x)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
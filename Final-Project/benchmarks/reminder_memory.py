@@ -0,0 +1,44 @@
+# Resident memory per reminder: list of Reminder objects vs ReminderTable
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from Reminder import Reminder
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+from ReminderTable import ReminderTable
+
+TITLES = ["Pay rent", "Team standup", "Call mom", "Gym", "Take medication",
+          "Submit timesheet", "Water plants", "Dentist appointment"]
+
+def make_reminders(count: int, seed: int = 345):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        rule = None
+        if rng.random() < 0.3:
+            rule = RecurrenceRule(rng.choice(list(RecurrenceType)), rng.randint(1, 4))
+        yield Reminder(
+            title=rng.choice(TITLES),
+            datetime=start + timedelta(minutes=rng.randint(0, 525600)),
+            description=None if rng.random() < 0.5 else f"note {i % 1000}",
+            recurrence_rule=rule,
+            completed=rng.random() < 0.4
+        )
+
+def measure(build) -> int:
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+def main(count: int = 200_000) -> None:
+    objects = measure(lambda: list(make_reminders(count)))
+    table = measure(lambda: ReminderTable(make_reminders(count)))
+    print(f"reminders:        {count}")
+    print(f"list[Reminder]:   {objects / count:.0f} bytes/reminder")
+    print(f"ReminderTable:    {table / count:.0f} bytes/reminder ({objects / table:.1f}x smaller)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,69 @@
+# Search latency over one user's reminders: rare and common words,
+# prefixes, multi-word queries and combined filters, plus what the index
+# costs to build and to keep up to date
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from benchmarks.dataset import EPOCH, WORDS, reminders
+from Reminder import Reminder
+from ReminderManager import ReminderManager
+from StorageService import StorageService
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+def main(count: int = 1_000_000, rounds: int = 200) -> None:
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        StorageService(username="bench", data_dir=data_dir, snapshot_format="binary").save_reminders(reminders(count))
+        manager = ReminderManager(storage=StorageService(username="bench", data_dir=data_dir, compact_threshold=10 ** 9))
+        begin = time.perf_counter()
+        manager.search("warm up")
+        print(f"{count:,} reminders, index built in {time.perf_counter() - begin:.2f} s")
+
+        rng = random.Random(7)
+        month = timedelta(days=30)
+        cases = [
+            ("rare word", lambda: manager.search(f"{rng.randrange(count)} ")),
+            ("common word", lambda: manager.search(f"{rng.choice(WORDS)} ")),
+            ("prefix", lambda: manager.search(rng.choice(WORDS)[:3])),
+            ("two words", lambda: manager.search(f"{rng.choice(WORDS)} {rng.choice(WORDS)} ")),
+            ("pending + month", lambda: manager.search(rng.choice(WORDS), pending_only=True,
+                                                        start=EPOCH + rng.randrange(24) * month,
+                                                        end=EPOCH + (rng.randrange(24) + 1) * month)),
+            ("recurring only", lambda: manager.search(rng.choice(WORDS), recurring=True)),
+            ("no match", lambda: manager.search("zzzz")),
+            ("filters only", lambda: manager.search(pending_only=True, start=EPOCH + rng.randrange(700) * timedelta(days=1))),
+        ]
+        for name, query in cases:
+            samples = []
+            for _ in range(rounds):
+                begin = time.perf_counter()
+                query()
+                samples.append(time.perf_counter() - begin)
+            p50, p99 = percentiles(samples)
+            print(f"{name:>16}: p50 {p50 * 1e6:7.1f} us, p99 {p99 * 1e6:7.1f} us")
+
+        # keeping the index current on writes
+        new = [Reminder(title=f"follow up {i} with finance", datetime=datetime(2026, 6, 1), id=f"bench{i}") for i in range(rounds)]
+        begin = time.perf_counter()
+        for reminder in new:
+            manager.add_reminder(reminder)
+        add = (time.perf_counter() - begin) / rounds
+        assert len(manager.search("finance ", limit=None)) == rounds
+        begin = time.perf_counter()
+        for reminder in new:
+            manager.remove_reminder(reminder)
+        remove = (time.perf_counter() - begin) / rounds
+        print(f"add_reminder {add * 1e6:.0f} us, remove_reminder {remove * 1e6:.0f} us with the index maintained")
+        manager.storage.close()
+    finally:
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
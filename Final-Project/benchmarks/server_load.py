@@ -0,0 +1,74 @@
+# Load test for server.py: requests/s and latency percentiles as the number
+# of concurrent clients grows. Each client is one user on a keep-alive
+# connection running a mix of adds, listings and completions.
+import http.client
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from server import ReminderServer
+
+def percentile(samples, fraction: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def client(port: int, username: str, requests: int, latencies: list) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+
+    def call(method: str, path: str, body=None, token=None):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        begin = time.perf_counter()
+        conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response = conn.getresponse()
+        data = json.loads(response.read())
+        latencies.append(time.perf_counter() - begin)
+        return data
+
+    token = call("POST", "/login", {"username": username, "create": True})["token"]
+    added = []
+    for i in range(requests):
+        step = i % 4
+        if step in (0, 1):
+            added.append(call("POST", "/reminders", {"title": f"task {i}", "datetime": f"2026-03-{i % 28 + 1:02d} 09:00"},
+                              token)["id"])
+        elif step == 2:
+            call("GET", "/reminders?pending=1", token=token)
+        else:
+            call("POST", f"/reminders/{added.pop(0)}/complete", token=token)
+    conn.close()
+
+def run(port: int, clients: int, requests: int) -> None:
+    latencies: list = []
+    threads = [threading.Thread(target=client, args=(port, f"load{clients}-{c}", requests, latencies))
+               for c in range(clients)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - begin
+    print(f"{clients:>5} clients: {len(latencies) / elapsed:>8,.0f} req/s, "
+          f"p50 {percentile(latencies, 0.50) * 1000:6.2f} ms, p99 {percentile(latencies, 0.99) * 1000:7.2f} ms")
+
+def main(requests: int = 200, commit_window: float = 0.005) -> None:
+    data_dir = Path(tempfile.mkdtemp())
+    server = ReminderServer(("127.0.0.1", 0), data_dir=data_dir, commit_window=commit_window)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"{requests} requests per client, commit window {commit_window * 1000:.0f} ms")
+    try:
+        for clients in (1, 4, 16, 64):
+            run(server.server_port, clients, requests)
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 200, float(args[1]) if len(args) > 1 else 0.005)
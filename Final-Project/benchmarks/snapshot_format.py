@@ -0,0 +1,33 @@
+# JSON vs binary snapshots: file size, save and load time through
+# StorageService (tests/test_binary_snapshot.py checks they round-trip exactly)
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.dataset import reminders
+from StorageService import StorageService
+
+def main(sizes) -> None:
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        for count in sizes:
+            data = reminders(count)
+            for fmt in ("json", "binary"):
+                storage = StorageService(username=f"{fmt}{count}", data_dir=data_dir, snapshot_format=fmt)
+                begin = time.perf_counter()
+                storage.save_reminders(data)
+                save = time.perf_counter() - begin
+                begin = time.perf_counter()
+                loaded = StorageService(username=f"{fmt}{count}", data_dir=data_dir).load_reminders()
+                load = time.perf_counter() - begin
+                if len(loaded) != count:
+                    raise RuntimeError(f"{fmt} store of {count} reminders loaded {len(loaded)}")
+                size = storage.storage_path.stat().st_size
+                print(f"{fmt:>6} n={count:<8} {size / 1e6:7.2f} MB ({size / count:5.1f} B/record) "
+                      f"save={save:.3f}s load={load:.3f}s")
+    finally:
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,105 @@
+# Cold start of the command-line client, the way scripts and hooks launch
+# it: import time of ReminderBot (from python -X importtime), time until
+# the first menu is on screen, and for an account of `count` reminders how
+# long logging in takes and how long until the first page is listed
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.dataset import write_store
+from StorageService import StorageService
+from User import UserService
+
+PROJECT = Path(__file__).resolve().parent.parent
+
+def import_times(runs: int):
+    # cumulative microseconds for ReminderBot, and the slowest modules of the last run
+    totals, modules = [], []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import ReminderBot"],
+                                cwd=PROJECT, capture_output=True, text=True, check=True)
+        modules = []
+        for line in result.stderr.splitlines():
+            match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+            if match:
+                modules.append((int(match.group(1)), match.group(4).strip()))
+                if match.group(4) == "ReminderBot" and not match.group(3).strip(" "):
+                    totals.append(int(match.group(2)))
+    return statistics.median(totals), sorted(modules, reverse=True)[:6]
+
+class Session:
+    # main.py in a subprocess, driven through its prompts
+    def __init__(self, env):
+        self.began = time.perf_counter()
+        self.process = subprocess.Popen([sys.executable, "main.py"], cwd=PROJECT, env=env,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.output = b""
+
+    def wait_for(self, text: str) -> float:
+        # seconds since the last send (or launch) until `text` is printed
+        while text.encode() not in self.output:
+            chunk = os.read(self.process.stdout.fileno(), 65536)
+            if not chunk:
+                raise RuntimeError(f"main.py exited before printing {text!r}")
+            self.output += chunk
+        self.output = self.output[self.output.index(text.encode()) + len(text):]
+        return time.perf_counter() - self.began
+
+    def send(self, line: str) -> None:
+        self.process.stdin.write(line.encode() + b"\n")
+        self.process.stdin.flush()
+        self.began = time.perf_counter()
+
+    def close(self) -> None:
+        # keep draining: overdue reminders may still be printing on the way out
+        self.process.stdin.close()
+        while os.read(self.process.stdout.fileno(), 65536):
+            pass
+        self.process.wait()
+
+def main(count: int = 100_000, runs: int = 10) -> None:
+    total, slowest = import_times(runs)
+    print(f"import ReminderBot: {total / 1000:.1f} ms (median of {runs})")
+    print("  slowest modules (self time): " + ", ".join(f"{name} {us / 1000:.1f} ms" for us, name in slowest))
+
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        UserService(data_dir=data_dir).create_user("big")
+        write_store(count, data_dir, "big")
+        env = dict(os.environ, REMINDER_DATA_DIR=str(data_dir))
+        for backend in ("json", "binary"):
+            if backend == "binary":
+                storage = StorageService(username="big", data_dir=data_dir, snapshot_format="binary")
+                storage.save_reminders(storage.load_reminders())
+            env["REMINDER_STORAGE"] = backend
+            first_menu, logged_in, first_page = [], [], []
+            for _ in range(max(1, runs // 2)):
+                session = Session(env)
+                first_menu.append(session.wait_for("Enter your choice (1-2): "))
+                session.send("1")
+                session.wait_for("Enter username: ")
+                session.send("big")
+                logged_in.append(session.wait_for("Press Enter to continue..."))
+                session.send("")
+                session.wait_for("Enter your choice (1-7): ")
+                session.send("2")
+                first_page.append(session.wait_for("Press Enter to go back: "))
+                session.send("")
+                session.wait_for("Press Enter to continue...")
+                session.send("")
+                session.wait_for("Enter your choice (1-7): ")
+                session.send("7")
+                session.close()
+            print(f"{backend:>6}, {count:,} reminders: first menu {statistics.median(first_menu) * 1000:.0f} ms, "
+                  f"login {statistics.median(logged_in) * 1000:.0f} ms, "
+                  f"first page listed {statistics.median(first_page) * 1000:.0f} ms")
+    finally:
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,68 @@
+# JSON journal vs SQLite backend: bulk load, startup, single writes and
+# a "due in the next hour" query
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from Reminder import Reminder
+from StorageService import StorageService
+from SQLiteStorageService import SQLiteStorageService
+
+START = datetime(2026, 1, 1)
+
+def make_reminders(count: int, seed: int = 345):
+    rng = random.Random(seed)
+    return [Reminder(title=f"Reminder {i}",
+                     datetime=START + timedelta(minutes=rng.randint(0, 525600)),
+                     completed=rng.random() < 0.4)
+            for i in range(count)]
+
+def timed(action):
+    begin = time.perf_counter()
+    result = action()
+    return time.perf_counter() - begin, result
+
+def run(backend: str, reminders, data_dir: Path) -> dict:
+    def open_storage():
+        if backend == "sqlite":
+            return SQLiteStorageService(username="bench", data_dir=data_dir)
+        return StorageService(username="bench", data_dir=data_dir)
+
+    storage = open_storage()
+    results = {"bulk_save": timed(lambda: storage.save_reminders(reminders))[0]}
+    storage = open_storage()
+    results["load"] = timed(storage.load_reminders)[0]
+
+    extra = make_reminders(100, seed=7)
+    results["add_100"] = timed(lambda: [storage.record_add(r) for r in extra])[0]
+
+    hour_start = START + timedelta(days=180)
+    hour_end = hour_start + timedelta(hours=1)
+    if backend == "sqlite":
+        query = lambda: storage.due_between(hour_start, hour_end)
+    else:
+        # without an index the JSON backend has to load and filter everything
+        query = lambda: [r for r in open_storage().load_reminders()
+                         if not r.completed and hour_start <= r.datetime < hour_end]
+    results["due_next_hour"], due = timed(query)
+    results["due_count"] = len(due)
+    return results
+
+def main(sizes) -> None:
+    for count in sizes:
+        reminders = make_reminders(count)
+        for backend in ("json", "sqlite"):
+            data_dir = Path(tempfile.mkdtemp())
+            try:
+                results = run(backend, reminders, data_dir)
+            finally:
+                shutil.rmtree(data_dir)
+            print(f"{backend:>6} n={count:<8} save={results['bulk_save']:.3f}s load={results['load']:.3f}s "
+                  f"add_100={results['add_100'] * 1000:.1f}ms due_next_hour={results['due_next_hour'] * 1000:.1f}ms "
+                  f"({results['due_count']} due)")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
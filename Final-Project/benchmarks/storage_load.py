@@ -0,0 +1,55 @@
+# Startup cost of StorageService.load_reminders: the old json.load path
+# against the streaming loader, in time and peak traced memory
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from Reminder import Reminder
+from StorageService import StorageService
+
+def make_reminders(count: int, seed: int = 345):
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    return [Reminder(title=f"Reminder {i}", datetime=start + timedelta(minutes=rng.randint(0, 525600)),
+                     description="weekly sync" if i % 3 == 0 else None, completed=rng.random() < 0.4)
+            for i in range(count)]
+
+def json_load(storage: StorageService):
+    # what load_reminders did before: parse everything, then convert
+    with storage.storage_path.open('r') as f:
+        data = json.load(f)
+    return [storage._deserialize_reminder(d) for d in data]
+
+def measure(action):
+    # timed without tracing, then run again under tracemalloc for the peak
+    begin = time.perf_counter()
+    result = action()
+    elapsed = time.perf_counter() - begin
+    del result
+    tracemalloc.start()
+    result = action()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, len(result)
+
+def main(count: int = 200_000) -> None:
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        storage = StorageService(data_dir=data_dir)
+        storage.save_reminders(make_reminders(count))
+        size = storage.storage_path.stat().st_size
+        print(f"reminders: {count}, snapshot: {size / 1e6:.1f} MB")
+        for name, action in (("json.load", lambda: json_load(storage)),
+                             ("streaming", storage.load_reminders)):
+            elapsed, peak, loaded = measure(action)
+            print(f"{name:>10}: {elapsed:.2f}s, peak {peak / 1e6:.0f} MB, {loaded} loaded")
+    finally:
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
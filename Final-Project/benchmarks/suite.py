@@ -0,0 +1,195 @@
+# The benchmark suite: every scale runs in a fresh process on synthetic
+# data from benchmarks.dataset, results are written as JSON and compared
+# against a stored baseline so regressions show up.
+#
+#   python -m benchmarks.suite                           # 1k, 10k, 100k
+#   python -m benchmarks.suite --scales 1000 1000000 --output results.json
+#   python -m benchmarks.suite --save-baseline           # refresh benchmarks/baseline.json
+import argparse
+import json
+import multiprocessing
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import BinarySnapshot
+from benchmarks.dataset import iter_reminders, reminders, time_inputs
+from ReminderManager import ReminderManager
+from StorageService import StorageService
+from TimeParser import TimeParser
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+def latencies_us(action: Callable, items: List) -> Dict[str, float]:
+    samples = []
+    for item in items:
+        begin = time.perf_counter()
+        action(item)
+        samples.append(time.perf_counter() - begin)
+    samples.sort()
+    return {"p50_us": samples[len(samples) // 2] * 1e6, "p99_us": samples[int(len(samples) * 0.99)] * 1e6}
+
+def run_scale(count: int, seed: int) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        data = reminders(count, seed)
+        storage = StorageService(username="bench", data_dir=data_dir, compact_threshold=10 ** 9)
+        begin = time.perf_counter()
+        storage.save_reminders(data)
+        results["save_s"] = time.perf_counter() - begin
+        results["snapshot_bytes"] = storage.storage_path.stat().st_size
+
+        # serialization alone, without the file system
+        sample = data[:100_000]
+        begin = time.perf_counter()
+        encoded = [json.dumps(storage._serialize_reminder(r)) for r in sample]
+        results["json_encode_per_s"] = len(sample) / (time.perf_counter() - begin)
+        begin = time.perf_counter()
+        for text in encoded:
+            storage._deserialize_reminder(json.loads(text))
+        results["json_decode_per_s"] = len(sample) / (time.perf_counter() - begin)
+        results["json_bytes_per_record"] = sum(map(len, encoded)) / len(encoded)
+        begin = time.perf_counter()
+        packed = BinarySnapshot.encode(sample)
+        results["binary_encode_per_s"] = len(sample) / (time.perf_counter() - begin)
+        begin = time.perf_counter()
+        BinarySnapshot.decode(packed)
+        results["binary_decode_per_s"] = len(sample) / (time.perf_counter() - begin)
+        results["binary_bytes_per_record"] = len(packed) / len(sample)
+        del data, sample, encoded, packed
+
+        begin = time.perf_counter()
+        manager = ReminderManager(storage=StorageService(username="bench", data_dir=data_dir, compact_threshold=10 ** 9))
+        results["startup_load_s"] = time.perf_counter() - begin
+
+        ops = min(500, count)
+        new = list(iter_reminders(ops, seed + 1))
+        for name, value in latencies_us(manager.add_reminder, new).items():
+            results[f"add_{name}"] = value
+        pending = manager.get_pending_reminders()
+        step = max(1, len(pending) // (2 * ops))
+        targets = pending[::step][:2 * ops]
+        for name, value in latencies_us(manager.mark_completed, targets[:ops]).items():
+            results[f"complete_{name}"] = value
+        for name, value in latencies_us(manager.remove_reminder, targets[ops:]).items():
+            results[f"remove_{name}"] = value
+        manager.storage.close()
+        rss = peak_rss_mb()
+        if rss is not None:
+            results["peak_rss_mb"] = rss
+    finally:
+        shutil.rmtree(data_dir)
+    return results
+
+def run_time_parser(seed: int, count: int = 20_000) -> Dict[str, float]:
+    corpus = time_inputs(count, seed)
+    uncached = TimeParser(cache_size=0)
+    begin = time.perf_counter()
+    for text in corpus:
+        uncached.parse(text)
+    cold = time.perf_counter() - begin
+    parser = TimeParser()
+    parser.parse_many(corpus)
+    begin = time.perf_counter()
+    for text in corpus:
+        parser.parse(text)
+    warm = time.perf_counter() - begin
+    begin = time.perf_counter()
+    TimeParser().parse_many(corpus)
+    bulk = time.perf_counter() - begin
+    return {"parse_uncached_per_s": count / cold, "parse_cached_per_s": count / warm, "parse_many_per_s": count / bulk}
+
+def in_fresh_process(func: Callable, *args) -> Dict[str, float]:
+    # spawn, not fork, so peak RSS and caches start from nothing
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+def higher_is_better(name: str) -> bool:
+    # throughput; everything else (time, bytes, RSS) is lower-is-better
+    return name.endswith("_per_s")
+
+def best_of(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    # one run is too noisy to compare at the small scales
+    return {name: (max if higher_is_better(name) else min)(run[name] for run in runs) for name in runs[0]}
+
+def run_suite(scales: List[int], seed: int = 345, repeat: int = 3) -> Dict:
+    results = {"time_parser": best_of([in_fresh_process(run_time_parser, seed) for _ in range(repeat)])}
+    for count in scales:
+        print(f"running n={count:,} ...", file=sys.stderr)
+        results[f"n={count}"] = best_of([in_fresh_process(run_scale, count, seed) for _ in range(repeat)])
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    # prints a side-by-side table and returns the metrics that got worse by more than `tolerance`
+    regressions = []
+    print(f"{'metric':<40} {'baseline':>14} {'current':>14} {'change':>8}")
+    for group, metrics in current["results"].items():
+        for name, value in metrics.items():
+            before = baseline["results"].get(group, {}).get(name)
+            if before is None:
+                print(f"{group + ' ' + name:<40} {'-':>14} {value:>14,.4g} {'new':>8}")
+                continue
+            change = (value - before) / before if before else 0.0
+            worse = -change if higher_is_better(name) else change
+            flag = "  REGRESSION" if worse > tolerance else ""
+            if flag:
+                regressions.append(f"{group} {name}")
+            print(f"{group + ' ' + name:<40} {before:>14,.4g} {value:>14,.4g} {change:>+7.0%}{flag}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the reminder benchmark suite")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--seed", type=int, default=345)
+    parser.add_argument("--repeat", type=int, default=3, help="fresh runs per scale, the best one is kept")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    current = run_suite(args.scales, args.seed, args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(json.dumps(current, indent=2))
+        return
+    regressions = compare(current, json.loads(args.baseline.read_text()), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+if __name__ == "__main__":
+    main()
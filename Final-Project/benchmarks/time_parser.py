@@ -0,0 +1,99 @@
+# TimeParser throughput against the original strptime-based implementation
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from TimeParser import TimeParser
+
+class StrptimeParser:
+    # the original implementation, kept here as the reference point
+    relative_time_map = {'today': 0, 'tomorrow': 1, 'next week': 7, 'next month': 30}
+    time_shortcuts = {'morning': '09:00', 'noon': '12:00', 'afternoon': '14:00',
+                      'evening': '18:00', 'night': '20:00', 'midnight': '00:00'}
+    formats_to_try = ["%Y-%m-%d %H:%M", "%m/%d/%Y %H:%M", "%d/%m/%Y %H:%M",
+                      "%Y/%m/%d %H:%M", "%m-%d-%Y %H:%M", "%d-%m-%Y %H:%M"]
+
+    def parse(self, time_str: str) -> Optional[datetime]:
+        try:
+            time_str = time_str.lower().strip()
+            try:
+                return datetime.strptime(time_str, "%Y-%m-%d %H:%M")
+            except ValueError:
+                pass
+            for word, days in self.relative_time_map.items():
+                match = re.match(f"^{word}\\s+at\\s+(.+)$", time_str)
+                if match:
+                    time_value = self._parse_time_part(match.group(1))
+                    if time_value:
+                        return (datetime.now() + timedelta(days=days)).replace(
+                            hour=time_value.hour, minute=time_value.minute, second=0, microsecond=0)
+            shortcut = re.match(r"(\d{4}-\d{2}-\d{2})\s+(\w+)", time_str)
+            if shortcut and shortcut.group(2) in self.time_shortcuts:
+                return datetime.strptime(f"{shortcut.group(1)} {self.time_shortcuts[shortcut.group(2)]}",
+                                         "%Y-%m-%d %H:%M")
+            for fmt in self.formats_to_try:
+                try:
+                    return datetime.strptime(time_str, fmt)
+                except ValueError:
+                    continue
+            return None
+        except Exception:
+            return None
+
+    def _parse_time_part(self, time_str: str) -> Optional[datetime]:
+        if time_str in self.time_shortcuts:
+            return datetime.strptime(f"{datetime.now().date()} {self.time_shortcuts[time_str]}", "%Y-%m-%d %H:%M")
+        for fmt in ["%H:%M", "%I:%M%p", "%I:%M %p", "%H.%M"]:
+            try:
+                time_str = time_str.replace(".", ":")
+                return datetime.strptime(f"{datetime.now().date()} {time_str}", f"%Y-%m-%d {fmt}")
+            except ValueError:
+                continue
+        return None
+
+def make_corpus(count: int, seed: int = 345):
+    # a mix of the shapes users actually type, with many distinct values
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        day = datetime(2026, 1, 1) + timedelta(days=rng.randint(0, 730), minutes=rng.randint(0, 1439))
+        kind = rng.randint(0, 5)
+        if kind == 0:
+            corpus.append(day.strftime("%Y-%m-%d %H:%M"))
+        elif kind == 1:
+            corpus.append(day.strftime("%m/%d/%Y %H:%M"))
+        elif kind == 2:
+            corpus.append(day.strftime("%d-%m-%Y %H:%M"))
+        elif kind == 3:
+            corpus.append(f"{day:%Y-%m-%d} {rng.choice(list(StrptimeParser.time_shortcuts))}")
+        elif kind == 4:
+            corpus.append(f"{rng.choice(['today', 'tomorrow', 'next week'])} at {day:%I:%M} {rng.choice(['am', 'pm'])}")
+        else:
+            corpus.append(f"tomorrow at {day:%H:%M}")
+    return corpus
+
+def throughput(parse, corpus) -> float:
+    begin = time.perf_counter()
+    for text in corpus:
+        parse(text)
+    return len(corpus) / (time.perf_counter() - begin)
+
+def main(count: int = 100_000) -> None:
+    corpus = make_corpus(count)
+    reference = throughput(StrptimeParser().parse, corpus)
+    cold = throughput(TimeParser(cache_size=0).parse, corpus)
+    parser = TimeParser()
+    begin = time.perf_counter()
+    parser.parse_many(corpus)
+    batch = count / (time.perf_counter() - begin)
+    warm = throughput(parser.parse, corpus[:4096] * (count // 4096 or 1))
+    print(f"inputs:           {count}")
+    print(f"strptime parser:  {reference:,.0f}/s")
+    print(f"compiled, no cache: {cold:,.0f}/s ({cold / reference:.1f}x)")
+    print(f"parse_many:       {batch:,.0f}/s ({batch / reference:.1f}x)")
+    print(f"repeated inputs:  {warm:,.0f}/s ({warm / reference:.1f}x)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,47 @@
+# Login latency with many accounts: re-reading users.json per call (the old
+# get_user) against the cached UserService index
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from User import UserService
+
+def reread_get_user(service: UserService, username: str):
+    with service.storage_path.open('r') as f:
+        users = json.load(f)
+    return users.get(username)
+
+def latencies(action, usernames):
+    samples = []
+    for username in usernames:
+        begin = time.perf_counter()
+        action(username)
+        samples.append(time.perf_counter() - begin)
+    return samples
+
+def main(count: int = 1_000_000) -> None:
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        service = UserService(data_dir=data_dir)
+        begin = time.perf_counter()
+        for start in range(0, count, 100_000):
+            service.create_users(f"user{i}" for i in range(start, min(start + 100_000, count)))
+        print(f"users: {count}, signup in batches of 100k: {time.perf_counter() - begin:.1f}s")
+
+        probes = [f"user{i}" for i in range(0, count, max(1, count // 200))]
+        fresh = UserService(data_dir=data_dir)
+        begin = time.perf_counter()
+        fresh.login(probes[0])
+        print(f"first login (index load): {(time.perf_counter() - begin) * 1000:.0f} ms")
+        cached = latencies(fresh.login, probes)
+        reread = latencies(lambda name: reread_get_user(fresh, name), probes[:5])
+        print(f"cached login:     median {statistics.median(cached) * 1e6:.1f} us")
+        print(f"re-read per call: median {statistics.median(reread) * 1000:.0f} ms")
+    finally:
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -1,11 +1,16 @@
 # cli/main.py
+import os
+import sys
 from ReminderBot import ReminderBot
+from StorageService import warn_legacy_store
 
 def pause():
     input("\nPress Enter to continue...")
 
 def main():
-    bot = ReminderBot()
+    # REMINDER_STORAGE=json|binary|sqlite picks the reminder backend
+    bot = ReminderBot(storage_backend=os.environ.get("REMINDER_STORAGE", "json"))
+    warn_legacy_store()
     
     while True:
         bot.display_menu()
@@ -18,34 +23,49 @@ def main():
                 bot.handle_login()
             elif choice == "2":
                 print("Goodbye!")
+                bot.shutdown()
                 break
             else:
                 print("Invalid choice. Please try again.")
             pause()
         else:
-            choice = input("\nEnter your choice (1-6): ")
-            
-            if choice == "1":
-                bot.handle_add_reminder()
-                pause()
-            elif choice == "2":
-                bot.handle_list_reminders()
-                pause()
-            elif choice == "3":
-                bot.handle_mark_completed()
-                pause()
-            elif choice == "4":
-                bot.handle_remove_reminder()
-                pause()
-            elif choice == "5":
-                bot.logout()
-                pause()
-            elif choice == "6":
-                print("Goodbye!")
-                break
-            else:
-                print("Invalid choice. Please try again.")
+            choice = input("\nEnter your choice (1-7): ")
+            try:
+                if choice == "1":
+                    bot.handle_add_reminder()
+                    pause()
+                elif choice == "2":
+                    bot.handle_list_reminders()
+                    pause()
+                elif choice == "3":
+                    bot.handle_mark_completed()
+                    pause()
+                elif choice == "4":
+                    bot.handle_remove_reminder()
+                    pause()
+                elif choice == "5":
+                    bot.handle_search_reminders()
+                    pause()
+                elif choice == "6":
+                    bot.logout()
+                    pause()
+                elif choice == "7":
+                    print("Goodbye!")
+                    bot.shutdown()
+                    break
+                else:
+                    print("Invalid choice. Please try again.")
+                    pause()
+            except IOError as e:
+                # an unreadable reminder store is reported and the menu stays up
+                print(f"Error loading reminders: {e}")
                 pause()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--async" in sys.argv:
+        # same menu, served by the asyncio core so due reminders fire while waiting for input
+        import asyncio
+        import AsyncReminderBot
+        asyncio.run(AsyncReminderBot.main())
+    else:
+        main()
\ No newline at end of file
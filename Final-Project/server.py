@@ -0,0 +1,271 @@
+# server.py
+# Multi-user HTTP/JSON front end. Every request runs on its own thread;
+# sessions are bearer tokens, and each user's reminders live in their own
+# ReminderManager shard with its own lock, so users never block each other.
+import argparse
+import json
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from Reminder import Reminder
+from ReminderManager import ReminderShards
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+from StorageService import StorageService, warn_legacy_store
+from Metrics import metrics
+from TimeParser import TimeParser
+from User import UserService
+
+def reminder_to_json(reminder: Reminder) -> Dict:
+    rule = reminder.recurrence_rule
+    return {
+        "id": reminder.id,
+        "title": reminder.title,
+        "datetime": reminder.datetime.isoformat(),
+        "description": reminder.description,
+        "recurrence": {"type": rule.type.value, "interval": rule.interval} if rule else None,
+        "completed": reminder.completed,
+    }
+
+class ReminderServer(ThreadingHTTPServer):
+    '''
+    Shared state for every connection: the user index, the per-user shards
+    and the session table. The handler threads only ever touch it through
+    these thread-safe pieces.
+    '''
+    daemon_threads = True
+    # room for a burst of clients connecting at once
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], data_dir: Optional[Path] = None,
+                 commit_window: float = 0.0, max_loaded: int = 256, snapshot_format: str = "json"):
+        super().__init__(address, ReminderRequestHandler)
+        self.user_service = UserService(data_dir=data_dir)
+        self.shards = ReminderShards(
+            max_loaded=max_loaded,
+            storage_factory=lambda username: StorageService(username=username, data_dir=data_dir,
+                                                            commit_window=commit_window,
+                                                            snapshot_format=snapshot_format))
+        self.time_parser = TimeParser()
+        self._sessions: Dict[str, str] = {}  # token -> username
+        self._sessions_lock = threading.Lock()
+
+    def open_session(self, username: str) -> str:
+        token = secrets.token_hex(16)
+        with self._sessions_lock:
+            self._sessions[token] = username
+        return token
+
+    def close_session(self, token: str) -> None:
+        with self._sessions_lock:
+            self._sessions.pop(token, None)
+
+    def session_user(self, token: str) -> Optional[str]:
+        with self._sessions_lock:
+            return self._sessions.get(token)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.shards.close()
+
+class ReminderRequestHandler(BaseHTTPRequestHandler):
+    # keep-alive, so a client can reuse one connection for many requests
+    protocol_version = "HTTP/1.1"
+    # headers and body go out as separate writes; don't let them wait on delayed ACKs
+    disable_nagle_algorithm = True
+    server: ReminderServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: Optional[Dict] = None) -> None:
+        data = json.dumps(body if body is not None else {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_metrics(self) -> None:
+        # Prometheus scrape endpoint; empty unless REMINDER_METRICS=1
+        data = metrics.to_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        data = json.loads(self.rfile.read(length))
+        if not isinstance(data, dict):
+            raise ValueError("request body must be a JSON object")
+        return data
+
+    def _user(self) -> Optional[str]:
+        header = self.headers.get("Authorization", "")
+        return self.server.session_user(header[7:]) if header.startswith("Bearer ") else None
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            body = self._body() if method == "POST" else {}
+        except ValueError as e:
+            self._send(400, {"error": f"invalid JSON: {e}"})
+            return
+        if parts == ["login"] and method == "POST":
+            self._login(body)
+            return
+        if parts == ["metrics"] and method == "GET":
+            self._send_metrics()
+            return
+        username = self._user()
+        if username is None:
+            self._send(401, {"error": "Please log in first."})
+            return
+        try:
+            # held for the whole request, so the shard cannot be evicted under it
+            with self.server.shards.using(username) as manager:
+                self._route(method, parts, url, body, manager)
+        except IOError as e:
+            # the snapshot is unreadable, or sync() found the journal write failed
+            # and the change is not acknowledged
+            self._send(500, {"error": f"storage error: {e}"})
+
+    def _route(self, method: str, parts: List[str], url, body: Dict, manager) -> None:
+        if parts == ["logout"] and method == "POST":
+            self.server.close_session(self.headers["Authorization"][7:])
+            self._send(200)
+        elif parts == ["reminders"] and method == "GET":
+            self._list(manager, parse_qs(url.query))
+        elif parts == ["reminders", "search"] and method == "GET":
+            self._search(manager, parse_qs(url.query))
+        elif parts == ["reminders"] and method == "POST":
+            self._add_reminder(manager, body)
+        elif len(parts) == 3 and parts[0] == "reminders" and parts[2] == "complete" and method == "POST":
+            reminder = manager.get_reminder(parts[1])
+            if reminder is None:
+                self._send(404, {"error": "Reminder not found."})
+                return
+            manager.mark_completed(reminder)
+            manager.storage.sync()
+            self._send(200, reminder_to_json(reminder))
+        elif len(parts) == 2 and parts[0] == "reminders" and method == "DELETE":
+            reminder = manager.get_reminder(parts[1])
+            if reminder is None:
+                self._send(404, {"error": "Reminder not found."})
+                return
+            manager.remove_reminder(reminder)
+            manager.storage.sync()
+            self._send(200)
+        else:
+            self._send(404, {"error": "Unknown endpoint."})
+
+    def _login(self, body: Dict) -> None:
+        username = str(body.get("username") or "").strip()
+        if not username:
+            self._send(400, {"error": "username is required"})
+            return
+        user = self.server.user_service.get_user(username)
+        if user is None and body.get("create"):
+            user = self.server.user_service.create_user(username)
+        if user is None:
+            self._send(404, {"error": "User not found."})
+            return
+        self._send(200, {"token": self.server.open_session(username)})
+
+    def _list(self, manager, query: Dict) -> None:
+        # /reminders?pending=1&limit=100&cursor=...: one page in due-time
+        # order; pass next_cursor back to get the following page
+        try:
+            limit = int(query.get("limit", ["100"])[0])
+            page = manager.page(after=query.get("cursor", [None])[0], limit=max(1, min(limit, 1000)),
+                                pending_only=query.get("pending", ["0"])[0] in ("1", "true"))
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        self._send(200, {"reminders": [reminder_to_json(r) for r in page.reminders],
+                         "total": page.total, "next_cursor": page.next_cursor})
+
+    def _search(self, manager, query: Dict) -> None:
+        # /reminders/search?q=words&pending=1&from=...&to=...&recurring=1|0&limit=50
+        def param(name: str) -> str:
+            return query.get(name, [""])[0]
+
+        bounds = {}
+        for name in ("from", "to"):
+            if param(name):
+                bounds[name] = self.server.time_parser.parse(param(name))
+                if bounds[name] is None:
+                    self._send(400, {"error": f"invalid {name} datetime"})
+                    return
+        try:
+            limit = int(param("limit") or 50)
+        except ValueError:
+            self._send(400, {"error": "limit must be a number"})
+            return
+        recurring = {"1": True, "true": True, "0": False, "false": False}.get(param("recurring"))
+        reminders = manager.search(param("q"), pending_only=param("pending") in ("1", "true"),
+                                   start=bounds.get("from"), end=bounds.get("to"), recurring=recurring,
+                                   limit=max(1, min(limit, 1000)))
+        self._send(200, {"reminders": [reminder_to_json(r) for r in reminders]})
+
+    def _add_reminder(self, manager, body: Dict) -> None:
+        title = str(body.get("title") or "").strip()
+        when = self.server.time_parser.parse(str(body.get("datetime") or ""))
+        if not title or when is None:
+            self._send(400, {"error": "title and a valid datetime are required"})
+            return
+        rule = None
+        if body.get("recurrence"):
+            try:
+                interval = int(body["interval"]) if body.get("interval") is not None else 1
+                rule = RecurrenceRule(type=RecurrenceType(body["recurrence"]), interval=interval)
+            except (TypeError, ValueError) as e:
+                self._send(400, {"error": f"invalid recurrence: {e}"})
+                return
+        reminder = Reminder(title=title, datetime=when, description=body.get("description") or None,
+                            recurrence_rule=rule)
+        manager.add_reminder(reminder)
+        # acknowledge only once the write is on disk; waiting outside the
+        # manager lock lets other requests join the same group commit
+        manager.storage.sync()
+        self._send(201, reminder_to_json(reminder))
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve reminders to many users over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8345)
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--commit-window", type=float, default=0.0,
+                        help="seconds to gather journal writes into one fsync (0 syncs every write)")
+    parser.add_argument("--snapshot-format", choices=("json", "binary"), default="json",
+                        help="encoding for compacted snapshots; either is read back")
+    args = parser.parse_args()
+    server = ReminderServer((args.host, args.port), data_dir=args.data_dir, commit_window=args.commit_window,
+                            snapshot_format=args.snapshot_format)
+    warn_legacy_store(args.data_dir)
+    print(f"Serving reminders on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
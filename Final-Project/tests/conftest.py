@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the modules are imported flat, as when run from Final-Project
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
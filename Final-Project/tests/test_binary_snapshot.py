@@ -0,0 +1,127 @@
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+import BinarySnapshot
+from RecurrenceRule import RecurrenceRule, RecurrenceType
+from Reminder import Reminder
+from ReminderManager import ReminderManager
+from StorageService import SnapshotError, StorageService
+
+def edge_cases():
+    return [
+        Reminder(title="", datetime=datetime(1, 1, 1)),
+        Reminder(title="Zahnarzt 🦷 — ünïcödé", datetime=datetime(9999, 12, 31, 23, 59, 59, 999999),
+                 description="line one\nline two\x00"),
+        Reminder(title="imported", datetime=datetime(1969, 7, 20, 20, 17, 40, 123), id="ics-1234@example.com"),
+        Reminder(title="upper-case id", datetime=datetime(2026, 1, 1), id="ABCDEF0123456789ABCDEF0123456789"),
+        Reminder(title="rent", datetime=datetime(2026, 1, 31, 9), is_recurring=True, completed=True,
+                 recurrence_rule=RecurrenceRule(RecurrenceType.MONTHLY, 1, datetime(2026, 1, 31, 9))),
+        Reminder(title="standup", datetime=datetime(2026, 3, 2, 9, 30), is_recurring=True,
+                 recurrence_rule=RecurrenceRule(RecurrenceType.WEEKLY, 2)),
+    ]
+
+def sample(count: int, seed: int = 7):
+    # repeated titles and descriptions, a mix of completed and recurring reminders
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    reminders = []
+    for _ in range(count):
+        rule = None
+        if rng.random() < 0.2:
+            rule = RecurrenceRule(rng.choice(list(RecurrenceType)), rng.randint(1, 3))
+        reminders.append(Reminder(
+            title=f"task {rng.randrange(50)}",
+            datetime=start + timedelta(minutes=rng.randrange(500_000), microseconds=rng.randrange(1_000_000)),
+            description=rng.choice([None, "", "call back", "bring the forms"]),
+            is_recurring=rule is not None,
+            recurrence_rule=rule,
+            completed=rng.random() < 0.3,
+        ))
+    return edge_cases() + reminders
+
+class BinarySnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.data_dir)
+
+    def damage(self, data: bytes) -> bytes:
+        damaged = bytearray(data)
+        damaged[-3] ^= 0xFF
+        return bytes(damaged)
+
+    def test_round_trip(self):
+        reminders = sample(2000)
+        self.assertEqual(BinarySnapshot.decode(BinarySnapshot.encode(reminders)), reminders)
+        self.assertEqual(BinarySnapshot.decode(BinarySnapshot.encode([])), [])
+
+    def test_storage_converts_both_ways(self):
+        # a JSON store with a journal on top, compacted to binary, and back
+        reminders = sample(2000)
+        storage = StorageService(username="mixed", data_dir=self.data_dir, compact_threshold=10 ** 9)
+        storage.save_reminders(reminders[:1000])
+        storage.record_many(reminders[1000:])
+        storage.record_complete(reminders[0])
+        storage.close()
+        storage = StorageService(username="mixed", data_dir=self.data_dir, snapshot_format="binary")
+        loaded = storage.load_reminders()
+        self.assertEqual(len(loaded), len(reminders))
+        self.assertTrue(loaded[0].completed)
+        storage.save_reminders(loaded)
+        storage.close()
+        self.assertTrue(BinarySnapshot.is_binary(storage.storage_path.read_bytes()))
+        json_again = StorageService(username="mixed", data_dir=self.data_dir)
+        self.assertEqual(json_again.load_reminders(), loaded)
+        json_again.save_reminders(loaded)
+        self.assertFalse(BinarySnapshot.is_binary(json_again.storage_path.read_bytes()))
+        self.assertEqual(json_again.load_reminders(), loaded)
+        json_again.close()
+
+    def test_damage_is_detected(self):
+        data = BinarySnapshot.encode(sample(100))
+        for damaged in (self.damage(data), data[:-1], data[:10], b"XXXX" + data[4:]):
+            with self.assertRaises(ValueError):
+                BinarySnapshot.decode(damaged)
+
+    def test_damaged_file_raises_the_decode_error(self):
+        # decoded from an mmap: the views must be released before the error gets out
+        storage = StorageService(username="damaged", data_dir=self.data_dir, snapshot_format="binary")
+        storage.save_reminders(sample(10))
+        storage.close()
+        storage.storage_path.write_bytes(self.damage(storage.storage_path.read_bytes()))
+        storage = StorageService(username="damaged", data_dir=self.data_dir, snapshot_format="binary")
+        with self.assertRaisesRegex(SnapshotError, "checksum mismatch"):
+            storage.load_reminders()
+        storage.close()
+
+    def test_damaged_file_is_never_compacted_over(self):
+        originals = edge_cases()[:5]
+        storage = StorageService(username="damaged", data_dir=self.data_dir, snapshot_format="binary")
+        storage.save_reminders(originals)
+        storage.close()
+        damaged = self.damage(storage.storage_path.read_bytes())
+        storage.storage_path.write_bytes(damaged)
+
+        def manager():
+            return ReminderManager(username="damaged", storage=StorageService(
+                username="damaged", data_dir=self.data_dir, compact_threshold=2, snapshot_format="binary"))
+
+        with self.assertRaises(SnapshotError):
+            manager()
+        self.assertEqual(storage.storage_path.read_bytes(), damaged)
+
+        # damaged under a manager that already loaded it: writes stop too
+        storage.save_reminders(originals)
+        storage.close()
+        loaded = manager()
+        storage.storage_path.write_bytes(damaged)
+        with self.assertRaises(SnapshotError):
+            for i in range(3):
+                loaded.add_reminder(Reminder(title=f"new {i}", datetime=datetime(2026, 5, 1)))
+        loaded.storage.close()
+        self.assertEqual(storage.storage_path.read_bytes(), damaged)
+
+if __name__ == "__main__":
+    unittest.main()